@@ -7,12 +7,10 @@ import os
 import sys
 import argparse
 import logging
-import curses
 from typing import List
 
 from .modules import get_all_modules
 from .modules.base import DiagnosticModule
-from .ui.tui import EnhancedTUI
 from .ui.report import ReportGenerator
 
 # Setup logging
@@ -46,6 +44,10 @@ def check_root_privileges():
 
 def run_interactive_mode(modules: List[DiagnosticModule], args):
     """Run the tool in interactive mode."""
+    # Only the interactive mode needs curses
+    import curses
+    from .ui.tui import EnhancedTUI
+
     try:
         tui = EnhancedTUI(modules)
         selected_modules = tui.run()
@@ -61,7 +63,7 @@ def run_interactive_mode(modules: List[DiagnosticModule], args):
         # Show export options
         def show_export_ui(stdscr):
             tui = EnhancedTUI(selected_modules)
-            result = tui.show_export_options(stdscr, report)
+            result = tui.show_export_options(stdscr, report, report_gen)
             return result
 
         export_result = curses.wrapper(show_export_ui)
@@ -81,8 +83,7 @@ def run_non_interactive_mode(modules: List[DiagnosticModule], args):
         # If nothing selected and in non-interactive mode, select all
         selected_modules = modules
         for module in selected_modules:
-            module.enabled = True
-            module.set_all_subsections(True)
+            module.set_bulk(True)
 
     logger.info("Generating diagnostic report...")
     report_gen = ReportGenerator(selected_modules)
@@ -92,19 +93,17 @@ def run_non_interactive_mode(modules: List[DiagnosticModule], args):
     output_file = args.output
 
     if not output_file:
-        hostname = ReportGenerator.get_hostname_static()
-        timestamp = import_date_time().now().strftime("%Y%m%d_%H%M%S")
-        output_file = f"sysdiag_{hostname}_{timestamp}.{format_ext}"
+        output_file = f"sysdiag_{report_gen.hostname}_{report_gen.timestamp_file}.{format_ext}"
 
     if args.format == "json":
         # Convert to JSON
-        sections = report_gen.parse_report_to_json(report)
+        sections = report_gen.to_json()
         with open(output_file, "w") as f:
             import json
             json.dump(sections, f, indent=2)
     elif args.format == "html":
         # Convert to HTML
-        html = report_gen.generate_html_report(report)
+        html = report_gen.to_html()
         with open(output_file, "w") as f:
             f.write(html)
     else:
@@ -115,12 +114,6 @@ def run_non_interactive_mode(modules: List[DiagnosticModule], args):
     logger.info(f"Diagnostic report saved to: {output_file}")
 
 
-def import_date_time():
-    """Import datetime module."""
-    import datetime
-    return datetime
-
-
 def show_version():
     """Show version information."""
     from . import __version__
@@ -149,8 +142,7 @@ def main():
     # If check-all is specified, enable all modules
     if args.check_all:
         for module in modules:
-            module.enabled = True
-            module.set_all_subsections(True)
+            module.set_bulk(True)
 
     # Run in interactive or non-interactive mode
     if args.yes:
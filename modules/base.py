@@ -4,9 +4,12 @@ Base module for all diagnostic modules.
 """
 
 import os
+import re
+import errno
+import shlex
 import subprocess
 import logging
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Pattern
 
 # Setup logging
 logging.basicConfig(
@@ -15,6 +18,61 @@ logging.basicConfig(
 )
 logger = logging.getLogger("sysdiag")
 
+# Bytes read per step when scanning a log file backwards from its end
+TAIL_WINDOW = 1 << 20
+
+
+def _tail_blocks(f, window: int = TAIL_WINDOW):
+    """
+    Yield blocks of whole lines from a binary file, starting at its end.
+
+    Each block covers up to `window` bytes; the partial line at the start of a block
+    is carried over and completed by the next (earlier) block.
+    """
+    end = os.fstat(f.fileno()).st_size
+    carry = b""
+    while end > 0:
+        start = max(0, end - window)
+        f.seek(start)
+        block = f.read(end - start) + carry
+        if start > 0:
+            cut = block.find(b"\n") + 1 or len(block)
+            carry, block = block[:cut], block[cut:]
+        yield block
+        end = start
+
+
+def _universal_newlines(data: bytes) -> bytes:
+    """Turn \r\n and lone \r line endings into \n, as text mode reading does."""
+    if b"\r" in data:
+        data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    return data
+
+
+def _run_failure(command: List[str], error) -> str:
+    """Describe a command that could not be run, worded the same by every runner."""
+    return f"Failed to run command {' '.join(command)}: {error}"
+
+
+# Exit statuses sh uses for a command it could not start, and the error starting it
+# directly would have raised
+_SHELL_START_ERRORS = {127: (FileNotFoundError, errno.ENOENT), 126: (PermissionError, errno.EACCES)}
+
+
+# Lines of a config file that are neither comments nor blank; the data must
+# have \n line endings (see _universal_newlines)
+_CONFIG_LINE_PATTERN = re.compile(rb"(?m)^(?!#).*\S.*$")
+
+
+def _grep_lines(data: bytes, pattern: Pattern[bytes]) -> List[bytes]:
+    """
+    Return the lines of data that contain a match of pattern, in a single regex pass.
+
+    data must have \n line endings; pass raw output through _universal_newlines first.
+    """
+    return re.findall(rb"(?m)^.*(?:" + pattern.pattern + rb").*$", data, pattern.flags)
+
+
 class DiagnosticModule:
     """Base class for all diagnostic modules."""
 
@@ -52,26 +110,143 @@ class DiagnosticModule:
                 timeout=30
             )
 
-            output = result.stdout if result.returncode == 0 else f"Error: {result.stderr}"
+            return self._format_command_output(result.returncode, result.stdout, result.stderr,
+                                               trim_lines, filter_func)
+        except subprocess.TimeoutExpired:
+            return "Command timed out after 30 seconds"
+        except Exception as e:
+            return _run_failure(command, e)
 
-            # Apply filtering if provided
-            if filter_func and result.returncode == 0:
-                lines = output.splitlines()
-                filtered_lines = [line for line in lines if filter_func(line)]
-                output = "\n".join(filtered_lines)
+    def safe_run_command_bytes(self, command: List[str], trim_lines: int = 0,
+                               pattern: Optional[Pattern[bytes]] = None) -> bytes:
+        """
+        Run a command safely like safe_run_command, but keep its output as bytes.
 
-            # Trim to last N lines if requested
-            if trim_lines > 0 and result.returncode == 0:
-                lines = output.splitlines()
-                if len(lines) > trim_lines:
-                    output = "\n".join(lines[-trim_lines:])
-                    output = f"[...showing only last {trim_lines} lines...]\n{output}"
+        Filtering and trimming work on the raw output, so only the lines that are kept
+        ever need decoding. Prefer this for commands with large output.
+
+        Args:
+            command: Command to run as a list of strings
+            trim_lines: Number of last lines to keep (0 for all)
+            pattern: Compiled byte pattern a line must match to be kept
 
-            return output
+        Returns:
+            Command output as bytes
+        """
+        try:
+            result = subprocess.run(
+                command,
+                capture_output=True,
+                check=False,
+                timeout=30
+            )
         except subprocess.TimeoutExpired:
-            return "Command timed out after 30 seconds"
+            return b"Command timed out after 30 seconds"
+        except Exception as e:
+            return _run_failure(command, e).encode()
+
+        # Split lines like text=True would, so patterns never see a \r
+        if result.returncode != 0:
+            return b"Error: " + _universal_newlines(result.stderr)
+
+        output = _universal_newlines(result.stdout)
+
+        # Apply filtering if provided
+        if pattern is not None:
+            output = b"\n".join(_grep_lines(output, pattern))
+
+        # Trim to last N lines if requested
+        if trim_lines > 0:
+            lines = output.splitlines()
+            if len(lines) > trim_lines:
+                output = b"\n".join(lines[-trim_lines:])
+                output = b"[...showing only last %d lines...]\n%s" % (trim_lines, output)
+
+        return output
+
+    def safe_run_pipeline(self, commands: List[List[str]], trim_lines: Optional[List[int]] = None,
+                          filter_funcs: Optional[List[Optional[Callable[[str], bool]]]] = None,
+                          sep: str = "\x1e") -> List[str]:
+        """
+        Run several commands in a single shell, handling errors and filtering output.
+
+        The commands run one after another under one `sh -c`, so only one process is
+        started instead of one per command. Each command's output is followed by the
+        separator and its exit status, which keeps the results identical to calling
+        safe_run_command for each command.
+
+        Args:
+            commands: Commands to run, each as a list of strings
+            trim_lines: Number of last lines to keep per command (0 for all)
+            filter_funcs: Function to filter lines per command (None to keep all)
+            sep: Separator that must not appear in any command output
+
+        Returns:
+            Output of each command as string, in the order given
+        """
+        trim_lines = trim_lines or [0] * len(commands)
+        filter_funcs = filter_funcs or [None] * len(commands)
+        timeout = 30 * len(commands)
+
+        script = "; ".join(
+            f"{shlex.join(command)}; printf '{sep}%d{sep}' $?; printf '{sep}' >&2"
+            for command in commands
+        )
+
+        try:
+            result = subprocess.run(
+                ["sh", "-c", script],
+                capture_output=True,
+                text=True,
+                check=False,
+                timeout=timeout
+            )
+        except subprocess.TimeoutExpired:
+            return [f"Command timed out after {timeout} seconds"] * len(commands)
         except Exception as e:
-            return f"Failed to run command {' '.join(command)}: {str(e)}"
+            return [_run_failure(command, e) for command in commands]
+
+        # stdout holds "output, status" pairs and stderr one entry per command
+        stdout_parts = result.stdout.split(sep)
+        stderr_parts = result.stderr.split(sep)
+
+        outputs = []
+        for i, command in enumerate(commands):
+            try:
+                stdout, returncode, stderr = stdout_parts[2 * i], int(stdout_parts[2 * i + 1]), stderr_parts[i]
+            except (IndexError, ValueError):
+                outputs.append(_run_failure(command, "no output from shell"))
+                continue
+
+            if returncode in _SHELL_START_ERRORS:
+                # Report it as safe_run_command does when starting the command fails
+                error_type, code = _SHELL_START_ERRORS[returncode]
+                outputs.append(_run_failure(command, error_type(code, os.strerror(code), command[0])))
+            else:
+                outputs.append(self._format_command_output(returncode, stdout, stderr,
+                                                           trim_lines[i], filter_funcs[i]))
+
+        return outputs
+
+    def _format_command_output(self, returncode: int, stdout: str, stderr: str, trim_lines: int = 0,
+                               filter_func: Optional[Callable[[str], bool]] = None) -> str:
+        """Filter and trim the output of a finished command."""
+        output = stdout if returncode == 0 else f"Error: {stderr}"
+
+        # Apply filtering if provided
+        if filter_func and returncode == 0:
+            lines = output.splitlines()
+            filtered_lines = [line for line in lines if filter_func(line)]
+            output = "\n".join(filtered_lines)
+
+        # Trim to last N lines if requested
+        if trim_lines > 0 and returncode == 0:
+            lines = output.splitlines()
+            if len(lines) > trim_lines:
+                output = "\n".join(lines[-trim_lines:])
+                output = f"[...showing only last {trim_lines} lines...]\n{output}"
+
+        return output
 
     def safe_read_file(self, file_path: str, trim_lines: int = 0,
                        filter_func: Optional[Callable[[str], bool]] = None) -> str:
@@ -111,7 +286,105 @@ class DiagnosticModule:
         except Exception as e:
             return f"Failed to read file {file_path}: {str(e)}"
 
+    def safe_scan_file(self, file_path: str, patterns: Dict[str, Pattern[bytes]],
+                       trim_lines: int = 0) -> Dict[str, str]:
+        """
+        Read a file once and collect the lines matching each of several patterns.
+
+        All patterns are joined into one alternation that picks candidate lines in a
+        single regex pass over the raw file; only those lines are then checked against
+        the individual patterns. Use scoped inline flags such as (?i:...) in patterns
+        that should ignore case. When trimming, the file is scanned backwards from its
+        end and reading stops once every pattern has more than trim_lines matches, so
+        large logs are usually only read in part.
+
+        Args:
+            file_path: Path to the file
+            patterns: Compiled byte patterns keyed by result name
+            trim_lines: Number of last lines to keep per pattern (0 for all)
+
+        Returns:
+            Matching lines as string, keyed like patterns
+        """
+        any_pattern = re.compile(rb"(?m)^.*(?:" + b"|".join(p.pattern for p in patterns.values()) + rb").*$")
+        chunks = {name: [] for name in patterns}  # Per-block matches, newest block first
+        counts = dict.fromkeys(patterns, 0)
+
+        try:
+            with open(file_path, 'rb') as f:
+                for block in _tail_blocks(f):
+                    # Blocks end on a \n, so no \r\n pair is split between two blocks
+                    candidates = any_pattern.findall(_universal_newlines(block))
+                    for name, pattern in patterns.items():
+                        found = [line for line in candidates if pattern.search(line)]
+                        chunks[name].append(found)
+                        counts[name] += len(found)
+
+                    if trim_lines > 0 and all(count > trim_lines for count in counts.values()):
+                        break
+        except FileNotFoundError:
+            return dict.fromkeys(patterns, f"File not found: {file_path}")
+        except PermissionError:
+            return dict.fromkeys(patterns, f"Permission denied: {file_path}")
+        except Exception as e:
+            return dict.fromkeys(patterns, f"Failed to read file {file_path}: {str(e)}")
+
+        results = {}
+        for name, found in chunks.items():
+            lines = [line for chunk in reversed(found) for line in chunk]
+            content = b"\n".join(lines[-trim_lines:] if trim_lines > 0 else lines).decode("utf-8", "replace")
+
+            # Trim to last N lines if requested
+            if 0 < trim_lines < len(lines):
+                content = f"[...showing only last {trim_lines} lines...]\n{content}"
+
+            results[name] = content
+
+        return results
+
+    def safe_read_config_dir(self, directory: str, suffix: str = "") -> str:
+        """
+        Read all config files in a directory, without comments and blank lines.
+
+        Every file gets a "--- name ---" header. The raw contents are collected in one
+        buffer, so comment filtering and decoding run once for the whole directory.
+
+        Args:
+            directory: Path to the directory
+            suffix: Only read files whose name ends with this suffix
+
+        Returns:
+            Combined file contents as string
+        """
+        buffer = bytearray()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(suffix) or not entry.is_file():
+                        continue
+
+                    buffer += b"\n--- %s ---\n" % os.fsencode(entry.name)
+                    try:
+                        with open(entry.path, 'rb') as f:
+                            buffer += f.read()
+                    except Exception as e:
+                        buffer += f"Failed to read file {entry.path}: {str(e)}".encode()
+        except FileNotFoundError:
+            return f"Directory not found: {directory}"
+        except PermissionError:
+            return f"Permission denied: {directory}"
+        except Exception as e:
+            return f"Failed to read directory {directory}: {str(e)}"
+
+        lines = _CONFIG_LINE_PATTERN.findall(_universal_newlines(bytes(buffer)))
+        return b"\n".join(lines).decode("utf-8", "replace")
+
     def set_all_subsections(self, enabled: bool):
         """Set all subsections to enabled or disabled."""
-        for key in self.subsections:
-            self.subsections[key] = enabled
\ No newline at end of file
+        # One C-level pass; key order (the display order) is preserved
+        self.subsections = dict.fromkeys(self.subsections, enabled)
+
+    def set_bulk(self, enabled: bool):
+        """Enable or disable the module together with all of its subsections."""
+        self.enabled = enabled
+        self.set_all_subsections(enabled)
\ No newline at end of file
@@ -5,10 +5,67 @@ System related diagnostic modules.
 
 import os
 import re
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, FrozenSet, Pattern
 
 from .base import DiagnosticModule
 
+# Log line filters, keyed by the field they fill in the report
+_BOOT_LOG_PATTERNS = {
+    "problems": re.compile(rb"(?i:error|warning|fail|critical)")
+}
+
+
+def _lines_with_both(first: bytes, second: bytes) -> Pattern[bytes]:
+    """Compile a case-insensitive pattern matching lines that contain both alternations."""
+    return re.compile(rb"(?i:(?:%s).*(?:%s)|(?:%s).*(?:%s))" % (first, second, second, first))
+
+
+# Journal filters; each runs as one regex pass over the whole command output
+_CORRELATED_EVENTS_PATTERN = _lines_with_both(rb"start|stop|restart|reload|shutdown|boot",
+                                              rb"network|firewall|service|daemon|system")
+_RECURRING_ISSUES_PATTERN = _lines_with_both(rb"error|fail|critical",
+                                             rb"crash|killed|terminated|core dumped|segfault")
+_RESOURCE_EXHAUSTION_PATTERN = re.compile(
+    rb"(?i:out of memory|no space|disk full|cannot allocate|too many open files)")
+_CONTAINER_ERROR_PATTERNS = {
+    name: _lines_with_both(name.encode(), rb"error|fail|exit")
+    for name in ["docker", "podman", "lxc"]
+}
+
+_DPKG_INSTALLED_PATTERN = re.compile(rb"install ok installed")
+_APT_HISTORY_PATTERNS = {
+    "installed": re.compile(rb"Install:"),
+    "upgraded": re.compile(rb"Upgrade:")
+}
+_APT_TERM_PATTERNS = {
+    "failed": re.compile(rb"(?i:error)")
+}
+_RPM_HISTORY_PATTERNS = {
+    "installed": re.compile(rb"Installed"),
+    "upgraded": re.compile(rb"Upgraded"),
+    "failed": re.compile(rb"(?i:error)")
+}
+_PACMAN_HISTORY_PATTERNS = {
+    "installed": re.compile(rb"installed"),
+    "upgraded": re.compile(rb"upgraded"),
+    "failed": re.compile(rb"(?i:error|failed)")
+}
+
+
+@lru_cache(maxsize=None)
+def _path_executables() -> FrozenSet[str]:
+    """Return the names of all entries in the PATH directories (plus /usr/bin and /bin)."""
+    names = set()
+    directories = os.environ.get("PATH", "").split(os.pathsep) + ["/usr/bin", "/bin"]
+    for directory in dict.fromkeys(d for d in directories if d):
+        try:
+            with os.scandir(directory) as entries:
+                names.update(entry.name for entry in entries)
+        except OSError:
+            pass
+    return frozenset(names)
+
 
 class KernelLogsModule(DiagnosticModule):
     """Module for kernel boot and system logs."""
@@ -53,11 +110,7 @@ class KernelLogsModule(DiagnosticModule):
 
             for path in boot_log_paths:
                 if os.path.exists(path):
-                    log_content = self.safe_read_file(path, trim_lines=20,
-                                                      filter_func=lambda line: any(
-                                                          level in line.lower() for level in
-                                                          ["error", "warning", "fail", "critical"]
-                                                      ))
+                    log_content = self.safe_scan_file(path, _BOOT_LOG_PATTERNS, trim_lines=20)["problems"]
                     results[f"boot_log_{os.path.basename(path)}"] = log_content
 
             if not any(key.startswith("boot_log_") for key in results.keys()):
@@ -525,29 +578,23 @@ class VirtualizationContainerModule(DiagnosticModule):
             # Check container list
             if container_type == "Docker":
                 container_list = self.safe_run_command(["docker", "ps", "-a"])
-                container_errors = self.safe_run_command(["journalctl"],
-                                                         filter_func=lambda line: "docker" in line.lower() and
-                                                                                  any(error in line.lower() for error in
-                                                                                      ["error", "fail", "exit"]),
-                                                         trim_lines=20)
+                container_errors = self.safe_run_command_bytes(["journalctl"],
+                                                               pattern=_CONTAINER_ERROR_PATTERNS["docker"],
+                                                               trim_lines=20).decode("utf-8", "replace")
                 container_resources = self.safe_run_command(["docker", "stats", "--no-stream", "--all"])
 
             elif container_type == "Podman":
                 container_list = self.safe_run_command(["podman", "ps", "-a"])
-                container_errors = self.safe_run_command(["journalctl"],
-                                                         filter_func=lambda line: "podman" in line.lower() and
-                                                                                  any(error in line.lower() for error in
-                                                                                      ["error", "fail", "exit"]),
-                                                         trim_lines=20)
+                container_errors = self.safe_run_command_bytes(["journalctl"],
+                                                               pattern=_CONTAINER_ERROR_PATTERNS["podman"],
+                                                               trim_lines=20).decode("utf-8", "replace")
                 container_resources = self.safe_run_command(["podman", "stats", "--no-stream", "--all"])
 
             elif container_type == "LXC":
                 container_list = self.safe_run_command(["lxc-ls", "--fancy"])
-                container_errors = self.safe_run_command(["journalctl"],
-                                                         filter_func=lambda line: "lxc" in line.lower() and
-                                                                                  any(error in line.lower() for error in
-                                                                                      ["error", "fail", "exit"]),
-                                                         trim_lines=20)
+                container_errors = self.safe_run_command_bytes(["journalctl"],
+                                                               pattern=_CONTAINER_ERROR_PATTERNS["lxc"],
+                                                               trim_lines=20).decode("utf-8", "replace")
                 container_resources = "Resource statistics not available for LXC containers through standard commands"
 
             else:
@@ -604,17 +651,11 @@ class LogAnalysisModule(DiagnosticModule):
 
             # Check for correlated errors
             # (This is a simplified approach - full correlation would require more complex analysis)
-            correlated_events = self.safe_run_command(
+            correlated_events = self.safe_run_command_bytes(
                 ["journalctl", "-p", "notice..emerg", "--since", "yesterday"],
-                filter_func=lambda line: any(
-                    term in line.lower() for term in
-                    ["start", "stop", "restart", "reload", "shutdown", "boot"]
-                ) and any(
-                    svc in line.lower() for svc in
-                    ["network", "firewall", "service", "daemon", "system"]
-                ),
+                pattern=_CORRELATED_EVENTS_PATTERN,
                 trim_lines=20
-            )
+            ).decode("utf-8", "replace")
 
             results[
                 "consolidated_errors"] = f"Critical Errors (last 24h):\n{critical_errors}\n\n{error_pattern_summary}\n\nPotentially Correlated Events:\n{correlated_events}"
@@ -631,13 +672,15 @@ class LogAnalysisModule(DiagnosticModule):
 
             # Check logrotate.d
             if os.path.exists("/etc/logrotate.d"):
+                parts = [logrotate_config]
                 for file in os.listdir("/etc/logrotate.d")[:5]:  # Get first 5 files only
                     file_path = os.path.join("/etc/logrotate.d", file)
                     if os.path.isfile(file_path):
                         content = self.safe_read_file(file_path,
                                                       filter_func=lambda line: not line.startswith(
                                                           "#") and line.strip())
-                        logrotate_config += f"\n/etc/logrotate.d/{file}:\n{content}"
+                        parts.append(f"\n/etc/logrotate.d/{file}:\n{content}")
+                logrotate_config = "".join(parts)
 
             # Check for oversized logs
             big_logs = self.safe_run_command(
@@ -661,27 +704,18 @@ class LogAnalysisModule(DiagnosticModule):
             reboot_history = self.safe_run_command(["last", "reboot"], trim_lines=10)
 
             # Check for recurring issues
-            recurring_issues = self.safe_run_command(
+            recurring_issues = self.safe_run_command_bytes(
                 ["journalctl", "--since", "1 week ago"],
-                filter_func=lambda line: any(
-                    term in line.lower() for term in
-                    ["error", "fail", "critical"]
-                ) and any(
-                    svc in line.lower() for svc in
-                    ["crash", "killed", "terminated", "core dumped", "segfault"]
-                ),
+                pattern=_RECURRING_ISSUES_PATTERN,
                 trim_lines=20
-            )
+            ).decode("utf-8", "replace")
 
             # Check for resource exhaustion
-            resource_exhaustion = self.safe_run_command(
+            resource_exhaustion = self.safe_run_command_bytes(
                 ["journalctl", "--since", "1 week ago"],
-                filter_func=lambda line: any(
-                    term in line.lower() for term in
-                    ["out of memory", "no space", "disk full", "cannot allocate", "too many open files"]
-                ),
+                pattern=_RESOURCE_EXHAUSTION_PATTERN,
                 trim_lines=20
-            )
+            ).decode("utf-8", "replace")
 
             results[
                 "system_monitoring"] = f"System Uptime:\n{uptime}\n\nReboot History:\n{reboot_history}\n\nRecurring Critical Issues:\n{recurring_issues}\n\nResource Exhaustion Events:\n{resource_exhaustion}"
@@ -707,15 +741,20 @@ class PackageManagementModule(DiagnosticModule):
     def run(self) -> Dict[str, str]:
         results = {}
 
+        # Nothing to do, skip package manager detection as well
+        if not any(self.subsections.values()):
+            return results
+
         # Determine package manager type
-        if os.path.exists("/usr/bin/dpkg") or os.path.exists("/bin/dpkg"):
+        executables = _path_executables()
+        if "dpkg" in executables:
             package_manager = "apt"
-        elif os.path.exists("/usr/bin/rpm") or os.path.exists("/bin/rpm"):
-            if os.path.exists("/usr/bin/dnf") or os.path.exists("/bin/dnf"):
+        elif "rpm" in executables:
+            if "dnf" in executables:
                 package_manager = "dnf"
             else:
                 package_manager = "yum"
-        elif os.path.exists("/usr/bin/pacman") or os.path.exists("/bin/pacman"):
+        elif "pacman" in executables:
             package_manager = "pacman"
         else:
             package_manager = "unknown"
@@ -724,31 +763,26 @@ class PackageManagementModule(DiagnosticModule):
             # List installed packages
             if package_manager == "apt":
                 # Debian/Ubuntu
-                installed_packages = self.safe_run_command(
+                installed_packages = self.safe_run_command_bytes(
                     ["dpkg-query", "-W", "-f='${Status} ${Package} ${Version}\\n'"],
-                    filter_func=lambda line: "install ok installed" in line,
-                    trim_lines=20)
+                    pattern=_DPKG_INSTALLED_PATTERN,
+                    trim_lines=20).decode("utf-8", "replace")
 
-                pending_updates = self.safe_run_command(["apt", "list", "--upgradable"],
-                                                        trim_lines=20)
+                pending_updates = self.safe_run_command_bytes(["apt", "list", "--upgradable"],
+                                                              trim_lines=20).decode("utf-8", "replace")
 
                 repo_config = self.safe_read_file("/etc/apt/sources.list",
                                                   filter_func=lambda line: not line.startswith("#") and line.strip())
 
                 # Also check sources.list.d
                 if os.path.exists("/etc/apt/sources.list.d"):
-                    repo_config += "\n\n/etc/apt/sources.list.d contents:\n"
-                    for file in os.listdir("/etc/apt/sources.list.d"):
-                        if file.endswith(".list"):
-                            content = self.safe_read_file(f"/etc/apt/sources.list.d/{file}",
-                                                          filter_func=lambda line: not line.startswith(
-                                                              "#") and line.strip())
-                            repo_config += f"\n--- {file} ---\n{content}"
+                    fragments = self.safe_read_config_dir("/etc/apt/sources.list.d", ".list")
+                    repo_config += f"\n\n/etc/apt/sources.list.d contents:\n\n{fragments}"
 
             elif package_manager in ["yum", "dnf"]:
                 # Red Hat/CentOS/Fedora
-                installed_packages = self.safe_run_command([package_manager, "list", "installed"],
-                                                           trim_lines=20)
+                installed_packages = self.safe_run_command_bytes([package_manager, "list", "installed"],
+                                                                 trim_lines=20).decode("utf-8", "replace")
 
                 pending_updates = self.safe_run_command([package_manager, "check-update"],
                                                         trim_lines=20)
@@ -757,33 +791,24 @@ class PackageManagementModule(DiagnosticModule):
 
                 # Check for repo files
                 if os.path.exists("/etc/yum.repos.d"):
-                    repo_config += "\n\n/etc/yum.repos.d contents:\n"
-                    for file in os.listdir("/etc/yum.repos.d"):
-                        if file.endswith(".repo"):
-                            content = self.safe_read_file(f"/etc/yum.repos.d/{file}",
-                                                          filter_func=lambda line: not line.startswith(
-                                                              "#") and line.strip())
-                            repo_config += f"\n--- {file} ---\n{content}"
+                    fragments = self.safe_read_config_dir("/etc/yum.repos.d", ".repo")
+                    repo_config += f"\n\n/etc/yum.repos.d contents:\n\n{fragments}"
 
             elif package_manager == "pacman":
                 # Arch Linux
-                installed_packages = self.safe_run_command(["pacman", "-Q"],
-                                                           trim_lines=20)
+                installed_packages = self.safe_run_command_bytes(["pacman", "-Q"],
+                                                                 trim_lines=20).decode("utf-8", "replace")
 
-                pending_updates = self.safe_run_command(["pacman", "-Qu"],
-                                                        trim_lines=20)
+                pending_updates = self.safe_run_command_bytes(["pacman", "-Qu"],
+                                                              trim_lines=20).decode("utf-8", "replace")
 
                 repo_config = self.safe_read_file("/etc/pacman.conf",
                                                   filter_func=lambda line: not line.startswith("#") and line.strip())
 
                 # Check for pacman.d
                 if os.path.exists("/etc/pacman.d"):
-                    repo_config += "\n\n/etc/pacman.d contents:\n"
-                    for file in os.listdir("/etc/pacman.d"):
-                        content = self.safe_read_file(f"/etc/pacman.d/{file}",
-                                                      filter_func=lambda line: not line.startswith(
-                                                          "#") and line.strip())
-                        repo_config += f"\n--- {file} ---\n{content}"
+                    fragments = self.safe_read_config_dir("/etc/pacman.d")
+                    repo_config += f"\n\n/etc/pacman.d contents:\n\n{fragments}"
 
             else:
                 installed_packages = "Unable to determine package manager type"
@@ -794,69 +819,66 @@ class PackageManagementModule(DiagnosticModule):
                 "package_status"] = f"Package Manager: {package_manager}\n\nInstalled Packages (sample):\n{installed_packages}\n\nPending Updates:\n{pending_updates}\n\nRepository Configuration:\n{repo_config}"
 
         if self.subsections["package_dependencies"]:
-            # Check for broken dependencies
+            # Check for broken dependencies, package integrity and orphaned packages
             if package_manager == "apt":
                 # Debian/Ubuntu
-                dependency_check = self.safe_run_command(["apt", "check"],
-                                                         filter_func=lambda line: line.strip())
+                dependency_check, integrity_check, orphaned_packages = self.safe_run_pipeline(
+                    [["apt", "check"],
+                     ["debsums", "-s"],
+                     ["apt-get", "autoremove", "--dry-run"]],
+                    filter_funcs=[lambda line: line.strip(),
+                                  lambda line: line.strip(),
+                                  lambda line: "would be removed" in line or
+                                               "The following packages will be REMOVED" in line])
+
                 if not dependency_check.strip():
                     dependency_check = "No broken dependencies found"
 
-                # Check package integrity
-                integrity_check = self.safe_run_command(["debsums", "-s"],
-                                                        filter_func=lambda line: line.strip())
                 if not integrity_check.strip():
                     integrity_check = "No package integrity issues found"
                 elif "command not found" in integrity_check:
                     integrity_check = "debsums not installed"
 
-                # Check for orphaned packages
-                orphaned_packages = self.safe_run_command(["apt-get", "autoremove", "--dry-run"],
-                                                          filter_func=lambda line: "would be removed" in line or
-                                                                                   "The following packages will be REMOVED" in line)
                 if not orphaned_packages.strip():
                     orphaned_packages = "No orphaned packages found"
 
             elif package_manager in ["yum", "dnf"]:
                 # Red Hat/CentOS/Fedora
-                dependency_check = self.safe_run_command([package_manager, "check"],
-                                                         filter_func=lambda line: line.strip())
+                dependency_check, integrity_check, orphaned_packages = self.safe_run_pipeline(
+                    [[package_manager, "check"],
+                     [package_manager, "verify"],
+                     [package_manager, "autoremove", "--dry-run"]],
+                    trim_lines=[0, 20, 0],
+                    filter_funcs=[lambda line: line.strip(),
+                                  lambda line: line.strip(),
+                                  lambda line: "will be removed" in line or "Removing:" in line])
+
                 if not dependency_check.strip():
                     dependency_check = "No broken dependencies found"
 
-                # Check package integrity
-                integrity_check = self.safe_run_command([package_manager, "verify"],
-                                                        filter_func=lambda line: line.strip(),
-                                                        trim_lines=20)
                 if not integrity_check.strip():
                     integrity_check = "No package integrity issues found"
 
-                # Check for orphaned packages
-                orphaned_packages = self.safe_run_command([package_manager, "autoremove", "--dry-run"],
-                                                          filter_func=lambda line: "will be removed" in line or
-                                                                                   "Removing:" in line)
                 if not orphaned_packages.strip():
                     orphaned_packages = "No orphaned packages found"
 
             elif package_manager == "pacman":
                 # Arch Linux
-                dependency_check = self.safe_run_command(["pacman", "-Dk"],
-                                                         filter_func=lambda line: line.strip())
+                dependency_check, integrity_check, orphaned_packages = self.safe_run_pipeline(
+                    [["pacman", "-Dk"],
+                     ["pacman", "-Qk"],
+                     ["pacman", "-Qtd"]],
+                    trim_lines=[0, 20, 20],
+                    filter_funcs=[lambda line: line.strip(),
+                                  lambda line: "0 missing" not in line and line.strip(),
+                                  lambda line: line.strip()])
+
                 if not dependency_check.strip():
                     dependency_check = "No broken dependencies found"
 
-                # Check package integrity
-                integrity_check = self.safe_run_command(["pacman", "-Qk"],
-                                                        filter_func=lambda
-                                                            line: "0 missing" not in line and line.strip(),
-                                                        trim_lines=20)
                 if not integrity_check.strip():
                     integrity_check = "No package integrity issues found"
 
-                # Check for orphaned packages
-                orphaned_packages = self.safe_run_command(["pacman", "-Qtd"],
-                                                          filter_func=lambda line: line.strip(),
-                                                          trim_lines=20)
                 if not orphaned_packages.strip():
                     orphaned_packages = "No orphaned packages found"
 
@@ -869,87 +891,51 @@ class PackageManagementModule(DiagnosticModule):
                 "package_dependencies"] = f"Dependency Check:\n{dependency_check}\n\nPackage Integrity:\n{integrity_check}\n\nOrphaned Packages:\n{orphaned_packages}"
 
         if self.subsections["package_history"]:
-            # Show recently installed packages
+            # Show recently installed packages, upgrade history and failed installations
             if package_manager == "apt":
                 # Debian/Ubuntu
                 if os.path.exists("/var/log/apt/history.log"):
-                    recent_installs = self.safe_read_file("/var/log/apt/history.log",
-                                                          filter_func=lambda line: "Install:" in line,
-                                                          trim_lines=20)
+                    history = self.safe_scan_file("/var/log/apt/history.log", _APT_HISTORY_PATTERNS,
+                                                  trim_lines=20)
+                    recent_installs = history["installed"]
+                    upgrade_history = history["upgraded"]
                 else:
                     recent_installs = "APT history log not found"
-
-                # Display upgrade history
-                if os.path.exists("/var/log/apt/history.log"):
-                    upgrade_history = self.safe_read_file("/var/log/apt/history.log",
-                                                          filter_func=lambda line: "Upgrade:" in line,
-                                                          trim_lines=20)
-                else:
                     upgrade_history = "APT history log not found"
 
-                # Check for failed installations
                 if os.path.exists("/var/log/apt/term.log"):
-                    failed_installs = self.safe_read_file("/var/log/apt/term.log",
-                                                          filter_func=lambda
-                                                              line: "Error" in line or "error" in line.lower(),
-                                                          trim_lines=20)
+                    failed_installs = self.safe_scan_file("/var/log/apt/term.log", _APT_TERM_PATTERNS,
+                                                          trim_lines=20)["failed"]
                 else:
                     failed_installs = "APT term log not found"
 
             elif package_manager in ["yum", "dnf"]:
                 # Red Hat/CentOS/Fedora
                 if os.path.exists("/var/log/yum.log"):
-                    recent_installs = self.safe_read_file("/var/log/yum.log",
-                                                          filter_func=lambda line: "Installed" in line,
-                                                          trim_lines=20)
+                    history_log = "/var/log/yum.log"
                 elif os.path.exists("/var/log/dnf.log"):
-                    recent_installs = self.safe_read_file("/var/log/dnf.log",
-                                                          filter_func=lambda line: "Installed" in line,
-                                                          trim_lines=20)
+                    history_log = "/var/log/dnf.log"
                 else:
-                    recent_installs = f"{package_manager} log not found"
+                    history_log = None
 
-                # Display upgrade history
-                if os.path.exists("/var/log/yum.log"):
-                    upgrade_history = self.safe_read_file("/var/log/yum.log",
-                                                          filter_func=lambda line: "Upgraded" in line,
-                                                          trim_lines=20)
-                elif os.path.exists("/var/log/dnf.log"):
-                    upgrade_history = self.safe_read_file("/var/log/dnf.log",
-                                                          filter_func=lambda line: "Upgraded" in line,
-                                                          trim_lines=20)
+                if history_log:
+                    history = self.safe_scan_file(history_log, _RPM_HISTORY_PATTERNS, trim_lines=20)
+                    recent_installs = history["installed"]
+                    upgrade_history = history["upgraded"]
+                    failed_installs = history["failed"]
                 else:
+                    recent_installs = f"{package_manager} log not found"
                     upgrade_history = f"{package_manager} log not found"
-
-                # Check for failed installations
-                if os.path.exists("/var/log/yum.log"):
-                    failed_installs = self.safe_read_file("/var/log/yum.log",
-                                                          filter_func=lambda
-                                                              line: "Error" in line or "error" in line.lower(),
-                                                          trim_lines=20)
-                elif os.path.exists("/var/log/dnf.log"):
-                    failed_installs = self.safe_read_file("/var/log/dnf.log",
-                                                          filter_func=lambda
-                                                              line: "Error" in line or "error" in line.lower(),
-                                                          trim_lines=20)
-                else:
                     failed_installs = f"{package_manager} log not found"
 
             elif package_manager == "pacman":
                 # Arch Linux
                 if os.path.exists("/var/log/pacman.log"):
-                    recent_installs = self.safe_read_file("/var/log/pacman.log",
-                                                          filter_func=lambda line: "installed" in line,
-                                                          trim_lines=20)
-
-                    upgrade_history = self.safe_read_file("/var/log/pacman.log",
-                                                          filter_func=lambda line: "upgraded" in line,
-                                                          trim_lines=20)
-
-                    failed_installs = self.safe_read_file("/var/log/pacman.log",
-                                                          filter_func=lambda
-                                                              line: "error" in line.lower() or "failed" in line.lower(),
-                                                          trim_lines=20)
+                    history = self.safe_scan_file("/var/log/pacman.log", _PACMAN_HISTORY_PATTERNS,
+                                                  trim_lines=20)
+                    recent_installs = history["installed"]
+                    upgrade_history = history["upgraded"]
+                    failed_installs = history["failed"]
                 else:
                     recent_installs = "Pacman log not found"
                     upgrade_history = "Pacman log not found"
@@ -964,40 +950,31 @@ class PackageManagementModule(DiagnosticModule):
                 "package_history"] = f"Recently Installed Packages:\n{recent_installs}\n\nUpgrade History:\n{upgrade_history}\n\nFailed Installations:\n{failed_installs}"
 
         if self.subsections["repository_health"]:
-            # Verify repository access
+            # Verify repository access, check repository signing keys and
+            # test package manager functionality
             if package_manager == "apt":
                 # Debian/Ubuntu
-                repo_access = self.safe_run_command(["apt-get", "update", "--dry-run"],
-                                                    filter_func=lambda
-                                                        line: "Ign:" in line or "Hit:" in line or "Err:" in line)
-
-                # Check repository signing keys
-                repo_keys = self.safe_run_command(["apt-key", "list"],
-                                                  filter_func=lambda
-                                                      line: "/" in line or "pub" in line or "uid" in line)
-
-                # Test package manager functionality
-                package_test = self.safe_run_command(["apt-cache", "policy", "apt"])
+                repo_access, repo_keys, package_test = self.safe_run_pipeline(
+                    [["apt-get", "update", "--dry-run"],
+                     ["apt-key", "list"],
+                     ["apt-cache", "policy", "apt"]],
+                    filter_funcs=[lambda line: "Ign:" in line or "Hit:" in line or "Err:" in line,
+                                  lambda line: "/" in line or "pub" in line or "uid" in line,
+                                  None])
 
             elif package_manager in ["yum", "dnf"]:
                 # Red Hat/CentOS/Fedora
-                repo_access = self.safe_run_command([package_manager, "repolist"])
-
-                # Check repository signing keys
-                repo_keys = self.safe_run_command(["rpm", "-qa", "gpg-pubkey*"])
-
-                # Test package manager functionality
-                package_test = self.safe_run_command([package_manager, "info", package_manager])
+                repo_access, repo_keys, package_test = self.safe_run_pipeline(
+                    [[package_manager, "repolist"],
+                     ["rpm", "-qa", "gpg-pubkey*"],
+                     [package_manager, "info", package_manager]])
 
             elif package_manager == "pacman":
                 # Arch Linux
-                repo_access = self.safe_run_command(["pacman", "-Sy", "--dry-run"])
-
-                # Check repository signing keys
-                repo_keys = self.safe_run_command(["pacman-key", "--list-keys"])
-
-                # Test package manager functionality
-                package_test = self.safe_run_command(["pacman", "-Si", "pacman"])
+                repo_access, repo_keys, package_test = self.safe_run_pipeline(
+                    [["pacman", "-Sy", "--dry-run"],
+                     ["pacman-key", "--list-keys"],
+                     ["pacman", "-Si", "pacman"]])
 
             else:
                 repo_access = "Unable to determine package manager type"
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for the line handling shared by all diagnostic modules.
+"""
+
+import os
+import re
+import tempfile
+import unittest
+
+from ..modules.base import DiagnosticModule
+
+# CRLF lines, and a progress line ended by a lone CR, as left in logs like apt's term.log
+CRLF_FIXTURE = b"ok line\r\nan Error here\r\nprogress 10%\rError after lone CR\r\nlast\n"
+
+
+class LineEndingTest(unittest.TestCase):
+    """Byte-level helpers must split lines like text mode reading does."""
+
+    def setUp(self):
+        self.module = DiagnosticModule("test", "Test module")
+        fd, self.path = tempfile.mkstemp()
+        with os.fdopen(fd, "wb") as f:
+            f.write(CRLF_FIXTURE)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_scan_file_matches_read_file(self):
+        expected = self.module.safe_read_file(self.path, filter_func=lambda line: "Error" in line)
+        self.assertEqual(expected, "an Error here\nError after lone CR")
+        result = self.module.safe_scan_file(self.path, {"errors": re.compile(rb"Error")})
+        self.assertEqual(result["errors"], expected)
+
+    def test_run_command_bytes_matches_run_command(self):
+        expected = self.module.safe_run_command(["cat", self.path], filter_func=lambda line: "Error" in line)
+        result = self.module.safe_run_command_bytes(["cat", self.path], pattern=re.compile(rb"Error"))
+        self.assertEqual(result.decode(), expected)
+
+    def test_run_command_bytes_unfiltered(self):
+        expected = self.module.safe_run_command(["cat", self.path])
+        self.assertEqual(self.module.safe_run_command_bytes(["cat", self.path]).decode(), expected)
+
+    def test_read_config_dir(self):
+        directory = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(directory, "a.conf"), "wb") as f:
+                f.write(b"# comment\r\nkey=1\r\n\r\nother=2\rlast=3\n")
+            result = self.module.safe_read_config_dir(directory, ".conf")
+        finally:
+            os.unlink(os.path.join(directory, "a.conf"))
+            os.rmdir(directory)
+        self.assertEqual(result, "--- a.conf ---\nkey=1\nother=2\nlast=3")
+
+
+
+class PipelineTest(unittest.TestCase):
+    """safe_run_pipeline must report each command like safe_run_command."""
+
+    def test_start_failures_match_run_command(self):
+        module = DiagnosticModule("test", "Test module")
+        fd, not_executable = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            commands = [["no-such-command-sysdiag", "-a"], [not_executable], ["echo", "ok"]]
+            expected = [module.safe_run_command(command) for command in commands]
+            self.assertEqual(module.safe_run_pipeline(commands), expected)
+        finally:
+            os.unlink(not_executable)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,5 +3,18 @@
 UI module initialization for the Linux System Diagnostic Tool.
 """
 
-from .tui import EnhancedTUI
-from .report import ReportGenerator
\ No newline at end of file
+# Submodule providing each public class. They are imported on first access so
+# that report-only runs never load curses through the TUI.
+_EXPORTS = {
+    "EnhancedTUI": ".tui",
+    "ReportGenerator": ".report",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        from importlib import import_module
+        return getattr(import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,12 +4,13 @@ Report Generator for the Linux System Diagnostic Tool.
 """
 
 import os
-import json
+import socket
 import datetime
 import subprocess
 import logging
-import re
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+from html import escape
+from typing import List, Dict, Optional, Tuple
 
 from ..modules.base import DiagnosticModule
 
@@ -21,63 +22,159 @@ logging.basicConfig(
 logger = logging.getLogger("sysdiag.report")
 
 
+@dataclass
+class Section:
+    """A top-level report section: a header line plus its subsections."""
+    name: str
+    icon: str
+    subsections: List[Tuple[str, str]] = field(default_factory=list)
+    lines: List[str] = field(default_factory=list)  # Free-form lines shown before the subsections
+
+    @property
+    def heading(self) -> str:
+        return f"{self.icon} {self.name}"
+
+
 class ReportGenerator:
     """Generates the final diagnostic report."""
 
     def __init__(self, modules: List[DiagnosticModule]):
         self.modules = modules
+        self.sections: List[Section] = []
+        self.hostname = ""
+        self._report_time: Optional[datetime.datetime] = None
+        self.timestamp_text = ""  # For the report body
+        self.timestamp_file = ""  # For generated filenames
 
     def generate(self) -> str:
         """Generate the diagnostic report."""
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        hostname = self.get_hostname()
+        return self.to_text(self.collect())
 
-        report = [
-            "=" * 80,
-            f"🔍 LINUX SYSTEM DIAGNOSTIC REPORT 🔍",
-            f"📅 Generated: {timestamp}",
-            f"💻 Hostname: {hostname}",
-            "=" * 80,
-            ""
-        ]
+    def collect(self) -> List[Section]:
+        """Run every module and collect the results as report sections."""
+        self._set_report_time()
+        self.hostname = self.get_hostname()
 
         # Add system overview
         system_info = self.get_system_info()
-        report.append("📋 SYSTEM OVERVIEW")
-        report.append("-" * 80)
+        overview = Section("SYSTEM OVERVIEW", "📋")
         for key, value in system_info.items():
-            report.append(f"{key}: {value}")
-        report.append("")
+            overview.lines.append(f"{key}: {value}")
+        sections = [overview]
 
         # Run each module and add its results to the report
         for module in self.modules:
             logger.info(f"Running module: {module.name}")
 
             # Get appropriate icon for the module
-            icon = self.get_module_icon(module.name)
-            report.append(f"{icon} {module.description.upper()}")
-            report.append("-" * 80)
+            section = Section(module.description.upper(), self.get_module_icon(module.name))
+            sections.append(section)
 
             try:
                 results = module.run()
 
                 if not results:
-                    report.append("No results collected for this module.")
+                    section.lines.append("No results collected for this module.")
 
-                for section, content in results.items():
+                for subsection, content in results.items():
                     # Format section header
-                    section_title = section.replace("_", " ").title()
-                    report.append(f"### 📌 {section_title} ###")
-                    report.append(content)
-                    report.append("")
+                    section.subsections.append((subsection.replace("_", " ").title(), content))
             except Exception as e:
                 logger.error(f"Error running module {module.name}: {str(e)}")
-                report.append(f"❌ ERROR: Failed to run this module: {str(e)}")
+                section.lines.append(f"❌ ERROR: Failed to run this module: {str(e)}")
+
+        self.sections = sections
+        return sections
+
+    def _set_report_time(self):
+        """Take the report timestamp once so the body and filenames agree."""
+        self._report_time = datetime.datetime.now()
+        self.timestamp_text = self._report_time.strftime("%Y-%m-%d %H:%M:%S")
+        self.timestamp_file = self._report_time.strftime("%Y%m%d_%H%M%S")
+
+    def to_text(self, sections: Optional[List[Section]] = None) -> str:
+        """Render report sections as plain text."""
+        if sections is None:
+            sections = self.sections
+
+        report = [
+            "=" * 80,
+            f"🔍 LINUX SYSTEM DIAGNOSTIC REPORT 🔍",
+            f"📅 Generated: {self.timestamp_text}",
+            f"💻 Hostname: {self.hostname}",
+            "=" * 80,
+            ""
+        ]
 
+        for section in sections:
+            report.append(section.heading)
+            report.append("-" * 80)
+            report.extend(section.lines)
+            for title, content in section.subsections:
+                report.append(f"### 📌 {title} ###")
+                report.append(content)
+                report.append("")
             report.append("")
 
         return "\n".join(report)
 
+    def to_json(self, sections: Optional[List[Section]] = None) -> Dict[str, Dict[str, str]]:
+        """Render report sections as a JSON-serialisable structure."""
+        if sections is None:
+            sections = self.sections
+
+        return {
+            section.heading: {f"📌 {title}": content for title, content in section.subsections}
+            for section in sections
+            if section.subsections
+        }
+
+    def to_html(self, sections: Optional[List[Section]] = None) -> str:
+        """Render report sections as an HTML document."""
+        if sections is None:
+            sections = self.sections
+
+        # Basic HTML template
+        html_template = """<!DOCTYPE html>
+<html>
+<head>
+    <title>Linux System Diagnostic Report</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 20px; }}
+        h1 {{ color: #2c3e50; }}
+        h2 {{ color: #3498db; margin-top: 30px; border-bottom: 1px solid #ddd; }}
+        h3 {{ color: #2980b9; }}
+        pre {{ background-color: #f5f5f5; padding: 10px; border-radius: 5px; overflow-x: auto; }}
+        .timestamp {{ color: #7f8c8d; font-style: italic; }}
+        .section {{ margin-bottom: 30px; }}
+    </style>
+</head>
+<body>
+    <h1>Linux System Diagnostic Report</h1>
+    <div class="timestamp">Generated: {timestamp}</div>
+
+    {content}
+</body>
+</html>
+"""
+        content_html = []
+
+        for section in sections:
+            content_html.append('<div class="section">')
+            content_html.append(f'<h2>{escape(section.heading, quote=False)}</h2>')
+            for line in section.lines:
+                content_html.append(f'<p>{escape(line, quote=False)}</p>')
+            for title, content in section.subsections:
+                content_html.append(f'<h3>📌 {escape(title, quote=False)}</h3>')
+                content_html.append(f'<pre>{escape(content, quote=False)}</pre>')
+            content_html.append("</div>")
+
+        # Fill the template
+        return html_template.format(
+            timestamp=self.timestamp_text,
+            content="\n".join(content_html)
+        )
+
     def get_module_icon(self, module_name):
         """Return an appropriate icon for the module based on its name."""
         icons = {
@@ -109,15 +206,15 @@ class ReportGenerator:
     @staticmethod
     def get_hostname_static() -> str:
         """Static method to get system hostname."""
-        try:
-            return subprocess.run(
-                ["hostname"],
-                capture_output=True,
-                text=True,
-                check=False
-            ).stdout.strip()
-        except Exception:
-            return "unknown-host"
+        # gethostname() is a plain syscall; no need to spawn hostname(1)
+        hostname = socket.gethostname()
+        if not hostname:
+            try:
+                with open("/etc/hostname", "r") as f:
+                    hostname = f.read().strip()
+            except OSError:
+                pass
+        return hostname or "unknown-host"
 
     def get_system_info(self) -> Dict[str, str]:
         """Get basic system information."""
@@ -184,141 +281,19 @@ class ReportGenerator:
     def save_to_file(self, report: str, filename: str = None) -> str:
         """Save the report to a file."""
         if filename is None:
-            hostname = self.get_hostname()
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"sysdiag_{hostname}_{timestamp}.txt"
+            if self._report_time is None:
+                self._set_report_time()
+            hostname = self.hostname or self.get_hostname()
+            filename = f"sysdiag_{hostname}_{self.timestamp_file}.txt"
 
         try:
-            os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
-            with open(filename, "w") as f:
-                f.write(report)
+            # A bare filename goes to the current directory, which always exists
+            directory = os.path.dirname(filename)
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory, exist_ok=True)
+            with open(filename, "wb") as f:
+                f.write(report.encode("utf-8"))
             return filename
         except Exception as e:
             logger.error(f"Error saving report: {str(e)}")
             return None
-
-    def parse_report_to_json(self, report):
-        """Parse a text report into a JSON structure."""
-        sections = {}
-        current_section = None
-        current_subsection = None
-        current_content = []
-
-        for line in report.splitlines():
-            # Check for main section headers (all caps with dashes below)
-            if line and all(c.isupper() or c.isspace() or c in "🔍📅💻📋💾📁🔄🧩📜🖥️📝🚑⚙️🛠️🌐🔒👤📦⚡🚦📊" for c in line):
-                if current_section and current_subsection:
-                    if current_section not in sections:
-                        sections[current_section] = {}
-                    sections[current_section][current_subsection] = "\n".join(current_content)
-                    current_content = []
-
-                current_section = line.strip()
-                current_subsection = None
-
-            # Check for subsection headers
-            elif line.startswith("### ") and line.endswith(" ###"):
-                if current_section and current_subsection:
-                    if current_section not in sections:
-                        sections[current_section] = {}
-                    sections[current_section][current_subsection] = "\n".join(current_content)
-                    current_content = []
-
-                current_subsection = line.strip("# ")
-
-            # Add content lines
-            elif current_section and current_subsection:
-                current_content.append(line)
-
-        # Don't forget the last section
-        if current_section and current_subsection and current_content:
-            if current_section not in sections:
-                sections[current_section] = {}
-            sections[current_section][current_subsection] = "\n".join(current_content)
-
-        return sections
-
-    def generate_html_report(self, report):
-        """Generate an HTML version of the report."""
-        # Basic HTML template
-        html_template = """<!DOCTYPE html>
-<html>
-<head>
-    <title>Linux System Diagnostic Report</title>
-    <style>
-        body { font-family: Arial, sans-serif; margin: 20px; }
-        h1 { color: #2c3e50; }
-        h2 { color: #3498db; margin-top: 30px; border-bottom: 1px solid #ddd; }
-        h3 { color: #2980b9; }
-        pre { background-color: #f5f5f5; padding: 10px; border-radius: 5px; overflow-x: auto; }
-        .timestamp { color: #7f8c8d; font-style: italic; }
-        .section { margin-bottom: 30px; }
-    </style>
-</head>
-<body>
-    <h1>Linux System Diagnostic Report</h1>
-    <div class="timestamp">Generated: {timestamp}</div>
-
-    {content}
-</body>
-</html>
-"""
-        # Parse the text report
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        content_html = []
-
-        in_section = False
-        in_subsection = False
-        section_name = ""
-
-        for line in report.splitlines():
-            # Skip empty lines at the start
-            if not in_section and not line.strip():
-                continue
-
-            # Process section headers
-            if line and all(c.isupper() or c.isspace() for c in line) and "-" * 10 in next(
-                    (report.splitlines()[i + 1:i + 2] or [""]), ""):
-                if in_section:
-                    content_html.append("</div>")  # Close previous section
-                content_html.append(f'<div class="section">')
-                content_html.append(f'<h2>{line}</h2>')
-                in_section = True
-                section_name = line
-
-            # Process subsection headers
-            elif line.startswith("### ") and line.endswith(" ###"):
-                if in_subsection:
-                    content_html.append("</pre>")  # Close previous subsection
-                subsection_name = line.strip("# ")
-                content_html.append(f'<h3>{subsection_name}</h3>')
-                content_html.append('<pre>')
-                in_subsection = True
-
-            # Process dashed lines (section separators)
-            elif line.startswith("-" * 10):
-                continue  # Skip separator lines
-
-            # Process content
-            elif in_subsection:
-                # Escape HTML entities
-                escaped_line = line.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-                content_html.append(escaped_line)
-
-            # Process other lines
-            elif in_section and not in_subsection and line.strip():
-                content_html.append(f'<p>{line}</p>')
-
-        # Close any open tags
-        if in_subsection:
-            content_html.append("</pre>")
-        if in_section:
-            content_html.append("</div>")
-
-        # Fill the template
-        html_output = html_template.format(
-            timestamp=timestamp,
-            content="\n".join(content_html)
-        )
-
-        return html_output
\ No newline at end of file
@@ -6,15 +6,12 @@ Enhanced TUI (Text User Interface) using curses for the Linux System Diagnostic
 import os
 import sys
 import curses
-import tempfile
-import subprocess
-import json
 import re
-import datetime
 import logging
 from typing import List, Dict, Any, Optional, Callable
 
 from ..modules.base import DiagnosticModule
+from .report import ReportGenerator
 
 # Setup logging
 logging.basicConfig(
@@ -23,6 +20,75 @@ logging.basicConfig(
 )
 logger = logging.getLogger("sysdiag.tui")
 
+# Report a lone Escape after 25ms instead of curses' default full second
+os.environ.setdefault("ESCDELAY", "25")
+
+# Emoji that may appear in a section header line besides capitals and spaces
+_HEADER_ICONS = frozenset("🔍📅💻📋💾📁🔄🧩📜🖥️📝🚑⚙️🛠️🌐🔒👤📦⚡🚦📊")
+
+# A section header is made only of capitals, whitespace and header emoji. Multi-
+# codepoint emoji such as "🖥️" match because the U+FE0F selector is in the set.
+# One fullmatch is as fast as str.isascii()/isupper() pre-checks on ASCII lines.
+_HEADER_RE = re.compile("[A-Z\\s%s]+" % "".join(sorted(_HEADER_ICONS)))
+
+
+# ASCII-only icons
+_ICONS_ASCII = {
+    "partition_disk": "[D]",
+    "filesystem": "[F]",
+    "bootloader": "[B]",
+    "initramfs": "[I]",
+    "kernel_logs": "[K]",
+    "hardware_info": "[H]",
+    "custom_scripts": "[C]",
+    "recovery_diagnostics": "[R]",
+    "boot_parameters": "[P]",
+    "grub_boot_diagnostics": "[G]",
+    "network_config": "[N]",
+    "security_info": "[S]",
+    "user_account": "[U]",
+    "package_management": "[P]",
+    "storage_io_performance": "[I]",
+    "system_service_status": "[S]",
+    "virtualization_container": "[V]",
+    "log_analysis": "[L]"
+}
+
+# Unicode icons (including emoji)
+_ICONS_UNICODE = {
+    "partition_disk": "💾",
+    "filesystem": "📁",
+    "bootloader": "🔄",
+    "initramfs": "🧩",
+    "kernel_logs": "📜",
+    "hardware_info": "🖥️",
+    "custom_scripts": "📝",
+    "recovery_diagnostics": "🚑",
+    "boot_parameters": "⚙️",
+    "grub_boot_diagnostics": "🛠️",
+    "network_config": "🌐",
+    "security_info": "🔒",
+    "user_account": "👤",
+    "package_management": "📦",
+    "storage_io_performance": "⚡",
+    "system_service_status": "🚦",
+    "virtualization_container": "📦",
+    "log_analysis": "📊"
+}
+
+
+# Clipboard tools that read the data to copy from stdin, in order of preference
+_CLIPBOARD_COMMANDS = (
+    ("wl-copy",),
+    ("xclip", "-selection", "clipboard"),
+    ("xsel", "--clipboard", "--input"),
+)
+
+
+# Most queued keys the main menu handles before drawing again, so a paste
+# storm still shows progress
+_MAX_KEYS_PER_FRAME = 32
+
 
 class EnhancedTUI:
     """Enhanced TUI for module selection and configuration using curses."""
@@ -37,11 +103,100 @@ class EnhancedTUI:
         self.status_message = ""
         self.run_selected = False
         # Start with all modules expanded
-        self.expanded_modules = set(range(len(modules)))
+        self._is_expanded = [True] * len(self.modules)
+        # Rows drawn by the last draw_main_menu call, used to redraw only what changed
+        self._prev_frame = None
+        # (height, width) of the main menu screen, refreshed on KEY_RESIZE
+        self._screen_size = None
+        # Whether a key changed anything since the menu was last drawn
+        self._dirty = True
+        # Pending confirmation ("quit" while the quit prompt is shown), else None
+        self._confirm_state = None
+        # Set once the quit prompt is answered with y
+        self._should_quit = False
+        # Main-menu key -> handler, looked up once per key press; letters are
+        # folded to lower case before the lookup
+        self._key_handlers = {
+            ord('q'): self._on_quit,
+            ord('r'): self._on_run,
+            ord('e'): self._on_export,
+            curses.KEY_UP: self._on_up, ord('k'): self._on_up,
+            curses.KEY_DOWN: self._on_down, ord('j'): self._on_down,
+            ord(' '): self._on_toggle,
+            10: self._on_toggle_expand, 13: self._on_toggle_expand,  # Enter key
+            curses.KEY_RIGHT: self._on_expand,
+            curses.KEY_LEFT: self._on_collapse,
+            curses.KEY_RESIZE: self._on_resize,
+            ord('a'): self._on_enable_all,
+            ord('n'): self._on_disable_all,
+        }
+        # Subsection names of each module, by module index; modules fix their
+        # subsections in __init__, so this never needs refreshing
+        self._subsection_lists = [list(m.subsections) for m in self.modules]
+        # Flat list of visible (module_index, indent_level, item) rows, spliced on
+        # expand/collapse, and the position of each module's own row in it
+        self._flat_view = []
+        self._module_pos = []
+        self._build_flat_view()
+        # Indent level and module index of the row at current_pos, kept by _move_to
+        self._current_indent = 0
+        self._current_module_idx = 0
+        if self._flat_view:  # An empty module list leaves nothing to select
+            self._move_to(self.current_pos)
+        # Number of enabled modules, kept up to date by the toggle and all/none keys
+        self._enabled_count = sum(1 for m in self.modules if m.enabled)
+        # Enabled modules, collected once when r starts the run
+        self._selected_cache = []
+        # (report, tokens) for the last report tokenized by the viewer
+        self._report_tokens = None
+        # Clipboard command that worked for the last copy
+        self._clipboard_cmd = None
+        # Color attributes, filled in by _init_colors once curses is running
+        self._C_HEADER = self._C_HIGHLIGHT = self._C_ENABLED = self._C_DISABLED = self._C_SPECIAL = 0
 
         # Determine if unicode is supported
         self.use_unicode = self.check_unicode_support()
 
+        # Checkbox and expander glyphs for this terminal
+        if self.use_unicode:
+            self._CB_ON, self._CB_OFF, self._EX_ON, self._EX_OFF = "✅", "❌", "▼", "▶"
+        else:
+            self._CB_ON, self._CB_OFF, self._EX_ON, self._EX_OFF = "[X]", "[ ]", "[-]", "[+]"
+
+        # Per-module drawing lookups; names and icons never change while the menu is open
+        self._icon_for = {m.name: self.get_module_icon(m.name, not self.use_unicode) for m in self.modules}
+        self._sub_display = {name: name.replace("_", " ").title() for m in self.modules for name in m.subsections}
+
+        # Every rendering of a row, so drawing is a lookup: module titles are indexed
+        # [module_index][expanded][enabled] and subsection labels [enabled]
+        self._module_titles = []
+        self._desc_x = {}
+        for m in self.modules:
+            icon = self._icon_for[m.name]
+            expanders = (self._EX_OFF, self._EX_ON) if m.subsections else ("   ", "   ")
+            titles = tuple(tuple(f"{ex} {cb} {icon} {m.name}" for cb in (self._CB_OFF, self._CB_ON))
+                           for ex in expanders)
+            self._module_titles.append(titles)
+            # Column of the description, one space after the title
+            self._desc_x[m.name] = 2 + len(titles[0][0]) + 1
+        self._sub_labels = {name: (f"{self._CB_OFF} {label}", f"{self._CB_ON} {label}")
+                            for name, label in self._sub_display.items()}
+
+    def _init_colors(self):
+        """Set up the color pairs once per curses session."""
+        curses.start_color()
+        curses.init_pair(1, curses.COLOR_WHITE, curses.COLOR_BLUE)  # Header
+        curses.init_pair(2, curses.COLOR_YELLOW, curses.COLOR_BLACK)  # Highlighted items
+        curses.init_pair(3, curses.COLOR_GREEN, curses.COLOR_BLACK)  # Enabled items
+        curses.init_pair(4, curses.COLOR_RED, curses.COLOR_BLACK)  # Disabled items
+        curses.init_pair(5, curses.COLOR_CYAN, curses.COLOR_BLACK)  # Special highlights
+
+        self._C_HEADER = curses.color_pair(1)
+        self._C_HIGHLIGHT = curses.color_pair(2)
+        self._C_ENABLED = curses.color_pair(3)
+        self._C_DISABLED = curses.color_pair(4)
+        self._C_SPECIAL = curses.color_pair(5)
+
     def check_unicode_support(self):
         """Check if the terminal supports unicode characters."""
         try:
@@ -54,50 +209,7 @@ class EnhancedTUI:
 
     def get_module_icon(self, module_name, use_ascii=False):
         """Return an appropriate icon for the module based on its name."""
-        if use_ascii:
-            # ASCII-only icons
-            icons = {
-                "partition_disk": "[D]",
-                "filesystem": "[F]",
-                "bootloader": "[B]",
-                "initramfs": "[I]",
-                "kernel_logs": "[K]",
-                "hardware_info": "[H]",
-                "custom_scripts": "[C]",
-                "recovery_diagnostics": "[R]",
-                "boot_parameters": "[P]",
-                "grub_boot_diagnostics": "[G]",
-                "network_config": "[N]",
-                "security_info": "[S]",
-                "user_account": "[U]",
-                "package_management": "[P]",
-                "storage_io_performance": "[I]",
-                "system_service_status": "[S]",
-                "virtualization_container": "[V]",
-                "log_analysis": "[L]"
-            }
-        else:
-            # Unicode icons (including emoji)
-            icons = {
-                "partition_disk": "💾",
-                "filesystem": "📁",
-                "bootloader": "🔄",
-                "initramfs": "🧩",
-                "kernel_logs": "📜",
-                "hardware_info": "🖥️",
-                "custom_scripts": "📝",
-                "recovery_diagnostics": "🚑",
-                "boot_parameters": "⚙️",
-                "grub_boot_diagnostics": "🛠️",
-                "network_config": "🌐",
-                "security_info": "🔒",
-                "user_account": "👤",
-                "package_management": "📦",
-                "storage_io_performance": "⚡",
-                "system_service_status": "🚦",
-                "virtualization_container": "📦",
-                "log_analysis": "📊"
-            }
+        icons = _ICONS_ASCII if use_ascii else _ICONS_UNICODE
         return icons.get(module_name, "*")
 
     def organize_modules(self) -> List[DiagnosticModule]:
@@ -107,25 +219,19 @@ class EnhancedTUI:
 
     def draw_main_menu(self, stdscr):
         """Draw the main menu with a tree-like structure and enhanced visuals."""
-        stdscr.clear()
-        h, w = stdscr.getmaxyx()
+        if self._screen_size is None:
+            self._screen_size = stdscr.getmaxyx()
+        h, w = self._screen_size
 
-        # Set up colors
-        curses.start_color()
-        curses.init_pair(1, curses.COLOR_WHITE, curses.COLOR_BLUE)  # Header
-        curses.init_pair(2, curses.COLOR_YELLOW, curses.COLOR_BLACK)  # Highlighted items
-        curses.init_pair(3, curses.COLOR_GREEN, curses.COLOR_BLACK)  # Enabled items
-        curses.init_pair(4, curses.COLOR_RED, curses.COLOR_BLACK)  # Disabled items
-        curses.init_pair(5, curses.COLOR_CYAN, curses.COLOR_BLACK)  # Special highlights
+        # Build the frame as rows of (x, text, attr) segments, then write only changed rows
+        frame = [()] * h
 
         # Draw header
         header = " Linux System Diagnostic Tool "
         if self.use_unicode:
             header = " 🔍 Linux System Diagnostic Tool 🔍 "
 
-        stdscr.attron(curses.color_pair(1) | curses.A_BOLD)
-        stdscr.addstr(1, (w - len(header)) // 2, header)
-        stdscr.attroff(curses.color_pair(1) | curses.A_BOLD)
+        frame[1] = ((max(0, (w - len(header)) // 2), header, self._C_HEADER | curses.A_BOLD),)
 
         # Draw help text
         help_text = "↑/↓/j/k: Navigate | Space: Check/Uncheck | Enter: Expand/Collapse | r: Run | q: Quit"
@@ -134,38 +240,18 @@ class EnhancedTUI:
 
         help_lines = [help_text[i:i + w - 4] for i in range(0, len(help_text), w - 4)]
         for i, line in enumerate(help_lines):
-            stdscr.addstr(3 + i, 2, line)
+            frame[3 + i] = ((2, line, 0),)
 
         # Draw status message
         if self.status_message:
-            stdscr.attron(curses.A_BOLD)
-            stdscr.addstr(h - 2, 2, self.status_message)
-            stdscr.attroff(curses.A_BOLD)
-
-        # Choose appropriate characters based on unicode support
-        if self.use_unicode:
-            checkbox_on = "✅"
-            checkbox_off = "❌"
-            expand_collapse_on = "▼"
-            expand_collapse_off = "▶"
-        else:
-            checkbox_on = "[X]"
-            checkbox_off = "[ ]"
-            expand_collapse_on = "[-]"
-            expand_collapse_off = "[+]"
+            frame[h - 2] = ((2, self.status_message, curses.A_BOLD),)
 
         # Draw modules list with tree-like view
         list_start_y = 5 + len(help_lines)
         max_visible_items = h - list_start_y - 3  # Leave room for status and bottom border
 
         # Calculate visible range
-        visible_items = []
-        for i, module in enumerate(self.modules):
-            visible_items.append((i, 0, module))  # (index, indent_level, module)
-            if i in self.expanded_modules:
-                for subsection_name in module.subsections:
-                    # Add a "fake" entry for each subsection
-                    visible_items.append((i, 1, subsection_name))
+        visible_items = self._flat_view
 
         # Determine which slice of items to show
         if self.current_pos >= max_visible_items:
@@ -175,79 +261,76 @@ class EnhancedTUI:
 
         end_idx = min(start_idx + max_visible_items, len(visible_items))
 
+        # Lookups used for every row, held in locals for the loop
+        modules = self.modules
+        current_pos = self.current_pos
+        sub_labels = self._sub_labels
+        module_titles = self._module_titles
+        is_expanded = self._is_expanded
+        desc_x = self._desc_x
+        c_enabled, c_disabled = self._C_ENABLED, self._C_DISABLED
+        a_reverse, a_bold = curses.A_REVERSE, curses.A_BOLD
+
         # Draw each visible item
         for i in range(start_idx, end_idx):
             module_idx, indent_level, item = visible_items[i]
             y_pos = list_start_y + (i - start_idx)
 
             # Draw selection indicator
-            if i == self.current_pos:
-                stdscr.attron(curses.A_REVERSE)
+            highlight = a_reverse if i == current_pos else 0
 
             # Calculate indentation
             indent = indent_level * 4
 
-            if isinstance(item, str):  # This is a subsection
-                module = self.modules[module_idx]
-                # Draw checkbox
-                checkbox = checkbox_on if module.subsections[item] else checkbox_off
-                # Format subsection name for display
-                display_name = item.replace("_", " ").title()
-
-                if module.subsections[item]:
-                    stdscr.attron(curses.color_pair(3))
-                else:
-                    stdscr.attron(curses.color_pair(4))
+            if indent_level:  # This is a subsection
+                enabled = modules[module_idx].subsections[item]
+                color = c_enabled if enabled else c_disabled
 
-                stdscr.addstr(y_pos, 2 + indent, f"{checkbox} {display_name}")
-
-                if module.subsections[item]:
-                    stdscr.attroff(curses.color_pair(3))
-                else:
-                    stdscr.attroff(curses.color_pair(4))
+                frame[y_pos] = ((2 + indent, sub_labels[item][enabled], color | highlight),)
 
             else:  # This is a module
                 module = item
-                # Draw expand/collapse indicator
-                if module.subsections:
-                    expand_indicator = expand_collapse_on if module_idx in self.expanded_modules else expand_collapse_off
-                else:
-                    expand_indicator = "   "
-
-                # Draw checkbox
-                checkbox = checkbox_on if module.enabled else checkbox_off
-
-                # Get module icon
-                icon = self.get_module_icon(module.name, not self.use_unicode)
+                color = c_enabled if module.enabled else c_disabled
 
-                if module.enabled:
-                    stdscr.attron(curses.color_pair(3))
-                else:
-                    stdscr.attron(curses.color_pair(4))
+                # Expander, checkbox, icon and name; bold to stand out from the description
+                title = module_titles[module_idx][is_expanded[module_idx]][module.enabled]
+                frame[y_pos] = ((2, title, color | a_bold | highlight),
+                                (desc_x[module.name], f"- {module.description}", color | highlight))
 
-                # Make the module name bold to stand out
-                stdscr.attron(curses.A_BOLD)
-                stdscr.addstr(y_pos, 2, f"{expand_indicator} {checkbox} {icon} {module.name}")
-                stdscr.attroff(curses.A_BOLD)
+        # Draw the quit prompt over the bottom of the list while it waits for an answer
+        if self._confirm_state == "quit":
+            confirm_msg = "Are you sure you want to quit? (y/n)"
+            frame[h - 4] = ((max(0, (w - len(confirm_msg)) // 2), confirm_msg, curses.A_BOLD),)
 
-                # Display the description in normal text
-                stdscr.addstr(y_pos, 2 + len(f"{expand_indicator} {checkbox} {icon} {module.name}") + 1,
-                              f"- {module.description}")
+        # Draw footer
+        frame[h - 1] = ((2, "Press 'q' to quit, 'r' to run diagnostics", curses.A_BOLD),)
+
+        # Stage the frame; the caller sends it to the terminal with curses.doupdate()
+        self._flush_frame(stdscr, frame)
+        stdscr.noutrefresh()
+
+    def _flush_frame(self, stdscr, frame):
+        """Write the rows of a frame that differ from the previously drawn frame."""
+        prev_frame = self._prev_frame
+        if prev_frame is None or len(prev_frame) != len(frame):
+            # First frame or new screen size: start from a blank screen
+            stdscr.clear()
+            prev_frame = [()] * len(frame)
+
+        for y, row in enumerate(frame):
+            if row == prev_frame[y]:
+                continue
 
-                if module.enabled:
-                    stdscr.attroff(curses.color_pair(3))
-                else:
-                    stdscr.attroff(curses.color_pair(4))
+            stdscr.move(y, 0)
+            stdscr.clrtoeol()
+            for x, text, attr in row:
+                try:
+                    stdscr.addstr(y, x, text, attr)
+                except curses.error:
+                    # Text running past the bottom right corner or the screen edge
+                    pass
 
-            # Turn off highlight
-            if i == self.current_pos:
-                stdscr.attroff(curses.A_REVERSE)
-
-        # Draw footer
-        stdscr.attron(curses.A_BOLD)
-        stdscr.addstr(h - 1, 2, "Press 'q' to quit, 'r' to run diagnostics")
-        stdscr.attroff(curses.A_BOLD)
-        stdscr.refresh()
+        self._prev_frame = frame
 
     def draw_subsection_menu(self, stdscr, module_index):
         """Draw the subsection menu for a module."""
@@ -255,31 +338,16 @@ class EnhancedTUI:
         stdscr.clear()
         h, w = stdscr.getmaxyx()
 
-        # Set up colors
-        curses.start_color()
-        curses.init_pair(1, curses.COLOR_WHITE, curses.COLOR_BLUE)  # Header
-        curses.init_pair(3, curses.COLOR_GREEN, curses.COLOR_BLACK)  # Enabled
-        curses.init_pair(4, curses.COLOR_RED, curses.COLOR_BLACK)  # Disabled
-
         # Draw header
-        icon = self.get_module_icon(module.name, not self.use_unicode)
-        header = f" Configure {icon} {module.name} subsections "
-        stdscr.attron(curses.color_pair(1) | curses.A_BOLD)
+        header = f" Configure {self._icon_for[module.name]} {module.name} subsections "
+        stdscr.attron(self._C_HEADER | curses.A_BOLD)
         stdscr.addstr(1, (w - len(header)) // 2, header)
-        stdscr.attroff(curses.color_pair(1) | curses.A_BOLD)
+        stdscr.attroff(self._C_HEADER | curses.A_BOLD)
 
         # Draw help text
         help_text = "Use Up/Down to navigate, Space to toggle, Escape or 'q' to go back"
         stdscr.addstr(3, (w - len(help_text)) // 2, help_text)
 
-        # Choose appropriate characters based on unicode support
-        if self.use_unicode:
-            checkbox_on = "✅"
-            checkbox_off = "❌"
-        else:
-            checkbox_on = "[X]"
-            checkbox_off = "[ ]"
-
         # Draw subsections list
         list_start_y = 5
         subsections = list(module.subsections.items())
@@ -291,22 +359,17 @@ class EnhancedTUI:
             if i == self.current_subsection_pos:
                 stdscr.attron(curses.A_REVERSE)
 
-            # Draw checkbox
-            checkbox = checkbox_on if enabled else checkbox_off
-            # Format subsection name for display
-            display_name = name.replace("_", " ").title()
-
             if enabled:
-                stdscr.attron(curses.color_pair(3))
+                stdscr.attron(self._C_ENABLED)
             else:
-                stdscr.attron(curses.color_pair(4))
+                stdscr.attron(self._C_DISABLED)
 
-            stdscr.addstr(y_pos, 4, f"{checkbox} {display_name}")
+            stdscr.addstr(y_pos, 4, self._sub_labels[name][enabled])
 
             if enabled:
-                stdscr.attroff(curses.color_pair(3))
+                stdscr.attroff(self._C_ENABLED)
             else:
-                stdscr.attroff(curses.color_pair(4))
+                stdscr.attroff(self._C_DISABLED)
 
             # Turn off highlight
             if i == self.current_subsection_pos:
@@ -316,26 +379,22 @@ class EnhancedTUI:
         stdscr.attron(curses.A_BOLD)
         stdscr.addstr(h - 1, 2, "Press 'q' or Escape to go back to main menu")
         stdscr.attroff(curses.A_BOLD)
-        stdscr.refresh()
+        stdscr.noutrefresh()
+        curses.doupdate()
 
     def draw_export_menu(self, stdscr):
         """Draw the export options menu."""
         stdscr.clear()
         h, w = stdscr.getmaxyx()
 
-        # Set up colors
-        curses.start_color()
-        curses.init_pair(1, curses.COLOR_WHITE, curses.COLOR_BLUE)  # Header
-        curses.init_pair(5, curses.COLOR_CYAN, curses.COLOR_BLACK)  # Options
-
         # Draw header
         header = " Export Options "
         if self.use_unicode:
             header = " 📊 Export Options 📊 "
 
-        stdscr.attron(curses.color_pair(1) | curses.A_BOLD)
+        stdscr.attron(self._C_HEADER | curses.A_BOLD)
         stdscr.addstr(1, (w - len(header)) // 2, header)
-        stdscr.attroff(curses.color_pair(1) | curses.A_BOLD)
+        stdscr.attroff(self._C_HEADER | curses.A_BOLD)
 
         # Draw options
         options = [
@@ -349,9 +408,9 @@ class EnhancedTUI:
 
         for i, option in enumerate(options):
             y_pos = 5 + i
-            stdscr.attron(curses.color_pair(5))
+            stdscr.attron(self._C_SPECIAL)
             stdscr.addstr(y_pos, 4, option)
-            stdscr.attroff(curses.color_pair(5))
+            stdscr.attroff(self._C_SPECIAL)
 
         # Draw instructions
         stdscr.attron(curses.A_BOLD)
@@ -360,13 +419,13 @@ class EnhancedTUI:
 
         # Draw footer
         stdscr.addstr(h - 1, 2, "Press 'q' to go back without exporting")
-        stdscr.refresh()
+        stdscr.noutrefresh()
 
-    def handle_export_choice(self, choice, report, stdscr=None):
+    def handle_export_choice(self, choice, report, report_gen, stdscr=None):
         """Handle the export option chosen by the user."""
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        hostname = self.get_hostname()
-        default_filename = f"sysdiag_{hostname}_{timestamp}"
+        # Name exports after the host and time the report was generated, as main.py does
+        hostname = report_gen.hostname or self.get_hostname()
+        default_filename = f"sysdiag_{hostname}_{report_gen.timestamp_file}"
 
         if choice == '1':
             # Default location
@@ -378,7 +437,6 @@ class EnhancedTUI:
             # Custom location
             if stdscr:
                 curses.echo()
-                h, w = stdscr.getmaxyx()
                 stdscr.addstr(15, 4, "Enter file path: ")
                 curses.curs_set(1)  # Show cursor
                 filename = stdscr.getstr(15, 20, 50).decode('utf-8')
@@ -396,44 +454,25 @@ class EnhancedTUI:
             # JSON format
             filename = f"/tmp/{default_filename}.json"
 
-            # Generate JSON object from report sections
-            report_sections = self.parse_report_to_json(report)
-            try:
-                with open(filename, 'w') as f:
-                    json.dump(report_sections, f, indent=2)
-                return f"JSON report exported to {filename}"
-            except Exception as e:
-                return f"Failed to export JSON report: {str(e)}"
+            # Render the report's sections, as the non-interactive export does
+            import json
+            success = self.write_to_file(json.dumps(report_gen.to_json(), indent=2), filename)
+            return f"JSON report exported to {filename}" if success else "Failed to export JSON report"
 
         elif choice == '4':
             # HTML format
             filename = f"/tmp/{default_filename}.html"
-            html_content = self.generate_html_report(report)
+            html_content = report_gen.to_html()
             success = self.write_to_file(html_content, filename)
             return f"HTML report exported to {filename}" if success else "Failed to export HTML report"
 
         elif choice == '5':
-            # Copy to clipboard (if xclip/xsel available)
+            # Copy to clipboard (if wl-copy/xclip/xsel available)
             try:
-                # Write to temp file first
-                temp_file = tempfile.NamedTemporaryFile(delete=False)
-                temp_file.write(report.encode('utf-8'))
-                temp_filename = temp_file.name
-                temp_file.close()
-
-                # Try xclip first, then xsel
-                try:
-                    subprocess.run(["xclip", "-selection", "clipboard", temp_filename], check=True)
-                    os.unlink(temp_filename)
-                    return "Report copied to clipboard using xclip"
-                except (subprocess.SubprocessError, FileNotFoundError):
-                    try:
-                        subprocess.run(["xsel", "--clipboard", "--input", temp_filename], check=True)
-                        os.unlink(temp_filename)
-                        return "Report copied to clipboard using xsel"
-                    except (subprocess.SubprocessError, FileNotFoundError):
-                        os.unlink(temp_filename)
-                        return "Clipboard utilities (xclip/xsel) not available"
+                tool = self.copy_to_clipboard(report.encode('utf-8'))
+                if tool:
+                    return f"Report copied to clipboard using {tool}"
+                return "Clipboard utilities (wl-copy/xclip/xsel) not available"
             except Exception as e:
                 return f"Failed to copy to clipboard: {str(e)}"
 
@@ -444,312 +483,285 @@ class EnhancedTUI:
         else:
             return "Invalid choice"
 
+    def copy_to_clipboard(self, data):
+        """Pipe data to the first clipboard tool that accepts it and return the tool's name."""
+        import subprocess
+
+        # Try the tool that worked last time before probing the others
+        candidates = [self._clipboard_cmd] if self._clipboard_cmd else []
+        for command in _CLIPBOARD_COMMANDS:
+            if command is self._clipboard_cmd:
+                continue
+            if command[0] == "wl-copy" and not os.environ.get("WAYLAND_DISPLAY"):
+                continue
+            candidates.append(command)
+
+        for command in candidates:
+            try:
+                subprocess.run(command, input=data, check=True)
+            except (subprocess.SubprocessError, FileNotFoundError):
+                continue
+            self._clipboard_cmd = command
+            return command[0]
+
+        self._clipboard_cmd = None
+        return None
+
     def get_hostname(self):
         """Get the system hostname."""
-        try:
-            return subprocess.run(
-                ["hostname"],
-                capture_output=True,
-                text=True,
-                check=False
-            ).stdout.strip()
-        except Exception:
-            return "unknown-host"
+        return ReportGenerator.get_hostname_static()
 
     def write_to_file(self, content, filename):
         """Write content to a file."""
         try:
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
-
-            with open(filename, 'w') as f:
-                f.write(content)
+            # Ensure directory exists (a bare filename goes to the current directory)
+            directory = os.path.dirname(filename)
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory, exist_ok=True)
+
+            # Encode up front so the whole file goes out in a single write
+            with open(filename, 'wb') as f:
+                f.write(content.encode('utf-8'))
             return True
         except Exception as e:
             logger.error(f"Failed to write to {filename}: {str(e)}")
             return False
 
-    def parse_report_to_json(self, report):
-        """Parse a text report into a JSON structure."""
-        sections = {}
-        current_section = None
-        current_subsection = None
-        current_content = []
-
-        for line in report.splitlines():
-            # Check for main section headers (all caps with dashes below)
-            if line and all(c.isupper() or c.isspace() or c in "🔍📅💻📋💾📁🔄🧩📜🖥️📝🚑⚙️🛠️🌐🔒👤📦⚡🚦📊" for c in line):
-                if current_section and current_subsection:
-                    if current_section not in sections:
-                        sections[current_section] = {}
-                    sections[current_section][current_subsection] = "\n".join(current_content)
-                    current_content = []
-
-                current_section = line.strip()
-                current_subsection = None
-
-            # Check for subsection headers
-            elif line.startswith("### ") and line.endswith(" ###"):
-                if current_section and current_subsection:
-                    if current_section not in sections:
-                        sections[current_section] = {}
-                    sections[current_section][current_subsection] = "\n".join(current_content)
-                    current_content = []
-
-                current_subsection = line.strip("# ")
-
-            # Add content lines
-            elif current_section and current_subsection:
-                current_content.append(line)
-
-        # Don't forget the last section
-        if current_section and current_subsection and current_content:
-            if current_section not in sections:
-                sections[current_section] = {}
-            sections[current_section][current_subsection] = "\n".join(current_content)
-
-        return sections
-
-    def generate_html_report(self, report):
-        """Generate an HTML version of the report."""
-        # Basic HTML template
-        html_template = """<!DOCTYPE html>
-<html>
-<head>
-    <title>Linux System Diagnostic Report</title>
-    <style>
-        body { font-family: Arial, sans-serif; margin: 20px; }
-        h1 { color: #2c3e50; }
-        h2 { color: #3498db; margin-top: 30px; border-bottom: 1px solid #ddd; }
-        h3 { color: #2980b9; }
-        pre { background-color: #f5f5f5; padding: 10px; border-radius: 5px; overflow-x: auto; }
-        .timestamp { color: #7f8c8d; font-style: italic; }
-        .section { margin-bottom: 30px; }
-        .toc { background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin-bottom: 20px; }
-        .toc ul { list-style-type: none; }
-        .toc li { margin: 5px 0; }
-        .toc a { text-decoration: none; color: #3498db; }
-        .toc a:hover { text-decoration: underline; }
-        button.top { position: fixed; bottom: 20px; right: 20px; padding: 10px; 
-                   background: #3498db; color: white; border: none; 
-                   border-radius: 5px; cursor: pointer; }
-        button.top:hover { background: #2980b9; }
-    </style>
-    <script>
-        function scrollToTop() {
-            window.scrollTo({top: 0, behavior: 'smooth'});
-        }
-    </script>
-</head>
-<body>
-    <h1>Linux System Diagnostic Report</h1>
-    <div class="timestamp">Generated: {timestamp}</div>
-
-    <div class="toc">
-        <h2>Table of Contents</h2>
-        {toc}
-    </div>
-
-    {content}
-
-    <button onclick="scrollToTop()" class="top">↑ Top</button>
-</body>
-</html>
-"""
-        # Parse the text report
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        content_html = []
-        toc_items = []
+    def _tokenize_report(self, report):
+        """Classify each report line once as a (kind, line) token.
 
-        in_section = False
-        in_subsection = False
-        section_name = ""
-        section_count = 0
+        Kinds are "section", "subsection", "sep", "blank" and "content". The
+        tokens of the last report are cached, so viewing it again does not
+        classify the lines a second time.
+        """
+        if self._report_tokens is not None and self._report_tokens[0] is report:
+            return self._report_tokens[1]
 
         lines = report.splitlines()
+        header = _HEADER_RE.fullmatch
+        dashes = "-" * 10
+        tokens = []
+        append = tokens.append
+
+        # Pair each line with the one below it; main section headers are all caps
+        # with dashes below. The cheap first-character tests run before the regex.
+        for line, following in zip(lines, lines[1:] + [""]):
+            if not line.strip():
+                kind = "section" if line and dashes in following and header(line) else "blank"
+            elif line[0] == "#" and line.startswith("### ") and line.endswith(" ###"):
+                kind = "subsection"
+            elif line[0] == "-" and line.startswith(dashes):
+                kind = "sep"
+            elif dashes in following and header(line):
+                kind = "section"
+            else:
+                kind = "content"
+            append((kind, line))
 
-        for i, line in enumerate(lines):
-            # Skip empty lines at the start
-            if not in_section and not line.strip():
-                continue
-
-            # Process section headers (all caps with dashes below)
-            if (line and all(c.isupper() or c.isspace() or c in "🔍📅💻📋💾📁🔄🧩📜🖥️📝🚑⚙️🛠️🌐🔒👤📦⚡🚦📊" for c in line) and
-                    i < len(lines) - 1 and "-" * 10 in lines[i + 1]):
-                if in_section:
-                    content_html.append("</div>")  # Close previous section
-
-                section_count += 1
-                section_id = f"section-{section_count}"
-                content_html.append(f'<div id="{section_id}" class="section">')
-                content_html.append(f'<h2>{line}</h2>')
-                toc_items.append(f'<li><a href="#{section_id}">{line}</a></li>')
-
-                in_section = True
-                section_name = line
-
-            # Process subsection headers
-            elif line.startswith("### ") and line.endswith(" ###"):
-                if in_subsection:
-                    content_html.append("</pre>")  # Close previous subsection
-
-                subsection_name = line.strip("# ")
-                subsection_id = f"subsection-{section_count}-{len(toc_items)}"
-                content_html.append(f'<h3 id="{subsection_id}">{subsection_name}</h3>')
-                content_html.append('<pre>')
-                toc_items.append(
-                    f'<li style="margin-left: 20px;"><a href="#{subsection_id}">{subsection_name}</a></li>')
-
-                in_subsection = True
-
-            # Process dashed lines (section separators)
-            elif line.startswith("-" * 10):
-                continue  # Skip separator lines
-
-            # Process content
-            elif in_subsection:
-                # Escape HTML entities
-                escaped_line = line.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-                content_html.append(escaped_line)
-
-            # Process other lines
-            elif in_section and not in_subsection and line.strip():
-                content_html.append(f'<p>{line}</p>')
-
-        # Close any open tags
-        if in_subsection:
-            content_html.append("</pre>")
-        if in_section:
-            content_html.append("</div>")
-
-        # Generate table of contents
-        toc_html = f'<ul>{"".join(toc_items)}</ul>'
-
-        # Fill the template
-        html_output = html_template.format(
-            timestamp=timestamp,
-            toc=toc_html,
-            content="\n".join(content_html)
-        )
-
-        return html_output
+        self._report_tokens = (report, tokens)
+        return tokens
 
     def display_report(self, stdscr, report):
         """Display the report on screen with scrolling."""
         stdscr.clear()
-        curses.init_pair(1, curses.COLOR_WHITE, curses.COLOR_BLUE)
-        curses.init_pair(2, curses.COLOR_YELLOW, curses.COLOR_BLACK)
-        curses.init_pair(3, curses.COLOR_GREEN, curses.COLOR_BLACK)
-
         h, w = stdscr.getmaxyx()
 
-        # Split the report into lines
-        lines = report.splitlines()
+        # Highlight section and subsection headers; everything else is plain
+        attr_for_kind = {
+            "section": self._C_HIGHLIGHT | curses.A_BOLD,
+            "subsection": self._C_ENABLED | curses.A_UNDERLINE,
+        }
+
+        # Split the report into lines and their attributes, once per report
+        tokens = self._tokenize_report(report)
+        lines = [line for _, line in tokens]
+        line_attrs = [attr_for_kind.get(kind, 0) for kind, _ in tokens]
         total_lines = len(lines)
 
-        # Setup scrolling
+        # Setup scrolling; report lines fill rows 1..h-2 between header and footer
         top_line = 0
-        bottom_line = min(top_line + h - 2, total_lines - 1)
+        bottom_line = min(top_line + h - 3, total_lines - 1)
+
+        # Let curses move the report rows with terminal scroll operations
+        stdscr.idlok(True)
+        stdscr.setscrreg(1, h - 2)
+
+        def draw_line(i):
+            """Draw report line i on its screen row, clearing what was there before."""
+            y = i - top_line + 1
+            stdscr.move(y, 0)
+            stdscr.clrtoeol()
+            if i < total_lines:
+                try:
+                    # Let curses truncate to fit width rather than slicing a copy
+                    stdscr.addnstr(y, 0, lines[i], w - 1, line_attrs[i])
+                except curses.error:
+                    # Handle curses errors when trying to write at the bottom right corner
+                    pass
 
-        # Display instructions in the header
         header = " Report Viewer - Use Up/Down/PgUp/PgDn to scroll, 'q' to exit "
-        stdscr.attron(curses.color_pair(1) | curses.A_BOLD)
-        stdscr.addstr(0, 0, header + " " * (w - len(header)))
-        stdscr.attroff(curses.color_pair(1) | curses.A_BOLD)
+        full_redraw = True
+        scroll_by = 0
 
         while True:
-            # Clear and redraw the screen
-            for i in range(1, h - 1):
-                stdscr.addstr(i, 0, " " * (w - 1))
-
-            # Display the visible portion of the report
-            for i in range(top_line, bottom_line + 1):
-                if i < total_lines and i - top_line + 1 < h:
-                    try:
-                        line = lines[i][:w - 1]  # Truncate to fit width
-
-                        # Highlight section headers
-                        if line and all(c.isupper() or c.isspace() or c in "🔍📅💻📋💾📁🔄🧩📜🖥️📝🚑⚙️🛠️🌐🔒👤📦⚡🚦📊" for c in line):
-                            stdscr.attron(curses.color_pair(2) | curses.A_BOLD)
-                            stdscr.addstr(i - top_line + 1, 0, line)
-                            stdscr.attroff(curses.color_pair(2) | curses.A_BOLD)
-                        # Highlight subsection headers
-                        elif line.startswith("### ") and line.endswith(" ###"):
-                            stdscr.attron(curses.color_pair(3) | curses.A_UNDERLINE)
-                            stdscr.addstr(i - top_line + 1, 0, line)
-                            stdscr.attroff(curses.color_pair(3) | curses.A_UNDERLINE)
+            if full_redraw:
+                # Display instructions in the header
+                stdscr.attron(self._C_HEADER | curses.A_BOLD)
+                try:
+                    stdscr.addstr(0, 0, header + " " * (w - len(header)))
+                except curses.error:
+                    pass
+                stdscr.attroff(self._C_HEADER | curses.A_BOLD)
+
+                # Redraw every report row
+                for i in range(top_line, top_line + h - 2):
+                    draw_line(i)
+            elif scroll_by:
+                # Shift the rows and draw only the lines scrolled into view
+                stdscr.scrollok(True)
+                stdscr.scroll(scroll_by)
+                stdscr.scrollok(False)
+                first = top_line + h - 2 - scroll_by if scroll_by > 0 else top_line
+                for i in range(first, first + abs(scroll_by)):
+                    draw_line(i)
+
+            if full_redraw or scroll_by:
+                # Show scrollbar if needed
+                if total_lines > h - 2:
+                    scrollbar_height = max(1, (h - 2) * (h - 2) // total_lines)
+                    scrollbar_pos = 1 + (h - 2 - scrollbar_height) * top_line // max(1, total_lines - (h - 2))
+
+                    for i in range(1, h - 1):
+                        if scrollbar_pos <= i < scrollbar_pos + scrollbar_height:
+                            try:
+                                stdscr.addch(i, w - 1, curses.ACS_BLOCK)
+                            except curses.error:
+                                pass
                         else:
-                            stdscr.addstr(i - top_line + 1, 0, line)
-                    except curses.error:
-                        # Handle curses errors when trying to write at the bottom right corner
-                        pass
-
-            # Show scrollbar if needed
-            if total_lines > h - 2:
-                scrollbar_height = max(1, (h - 2) * (h - 2) // total_lines)
-                scrollbar_pos = 1 + (h - 2 - scrollbar_height) * top_line // max(1, total_lines - (h - 2))
-
-                for i in range(1, h - 1):
-                    if scrollbar_pos <= i < scrollbar_pos + scrollbar_height:
-                        try:
-                            stdscr.addch(i, w - 1, curses.ACS_BLOCK)
-                        except curses.error:
-                            pass
-                    else:
-                        try:
-                            stdscr.addch(i, w - 1, curses.ACS_VLINE)
-                        except curses.error:
-                            pass
-
-            # Show position indicator
-            footer = f" Line {top_line + 1}-{bottom_line + 1} of {total_lines} "
-            try:
-                stdscr.addstr(h - 1, 0, footer + " " * (w - len(footer) - 1))
-            except curses.error:
-                pass
+                            try:
+                                stdscr.addch(i, w - 1, curses.ACS_VLINE)
+                            except curses.error:
+                                pass
 
-            stdscr.refresh()
+                # Show position indicator
+                footer = f" Line {top_line + 1}-{bottom_line + 1} of {total_lines} "
+                try:
+                    stdscr.addstr(h - 1, 0, footer + " " * (w - len(footer) - 1))
+                except curses.error:
+                    pass
 
-            # Handle keys
-            key = stdscr.getch()
+                stdscr.noutrefresh()
+                curses.doupdate()
 
-            if key == ord('q') or key == ord('Q') or key == 27:  # q, Q or ESC
-                break
-            elif key == curses.KEY_UP or key == ord('k') or key == ord('K'):
-                if top_line > 0:
-                    top_line -= 1
+            # Wait for a key, then apply every key already queued so a burst draws once
+            key = stdscr.getch()
+            prev_top = top_line
+            quit_viewer = False
+            resized = False
+            stdscr.nodelay(True)
+
+            while key != -1:
+                if key == ord('q') or key == ord('Q') or key == 27:  # q, Q or ESC
+                    quit_viewer = True
+                    break
+                elif key == curses.KEY_UP or key == ord('k') or key == ord('K'):
+                    if top_line > 0:
+                        top_line -= 1
+                        bottom_line = min(top_line + h - 3, total_lines - 1)
+                elif key == curses.KEY_DOWN or key == ord('j') or key == ord('J'):
+                    if bottom_line < total_lines - 1:
+                        top_line += 1
+                        bottom_line = min(top_line + h - 3, total_lines - 1)
+                elif key == curses.KEY_PPAGE:  # Page Up
+                    top_line = max(0, top_line - (h - 3))
                     bottom_line = min(top_line + h - 3, total_lines - 1)
-            elif key == curses.KEY_DOWN or key == ord('j') or key == ord('J'):
-                if bottom_line < total_lines - 1:
-                    top_line += 1
+                elif key == curses.KEY_NPAGE:  # Page Down
+                    top_line = min(total_lines - 1, top_line + (h - 3))
                     bottom_line = min(top_line + h - 3, total_lines - 1)
-            elif key == curses.KEY_PPAGE:  # Page Up
-                top_line = max(0, top_line - (h - 3))
-                bottom_line = min(top_line + h - 3, total_lines - 1)
-            elif key == curses.KEY_NPAGE:  # Page Down
-                top_line = min(total_lines - 1, top_line + (h - 3))
+                elif key == curses.KEY_HOME:
+                    top_line = 0
+                    bottom_line = min(h - 3, total_lines - 1)
+                elif key == curses.KEY_END:
+                    top_line = max(0, total_lines - (h - 2))
+                    bottom_line = total_lines - 1
+                elif key == curses.KEY_RESIZE:
+                    resized = True
+                key = stdscr.getch()
+
+            stdscr.nodelay(False)
+            if quit_viewer:
+                break
+
+            if resized:
+                # Lay the viewer out again at the new size
+                h, w = stdscr.getmaxyx()
+                stdscr.clear()
+                stdscr.setscrreg(1, h - 2)
                 bottom_line = min(top_line + h - 3, total_lines - 1)
-            elif key == curses.KEY_HOME:
-                top_line = 0
-                bottom_line = min(h - 3, total_lines - 1)
-            elif key == curses.KEY_END:
-                top_line = max(0, total_lines - (h - 2))
-                bottom_line = total_lines - 1
+
+            # Moves shorter than a page scroll; bigger jumps redraw; no move draws nothing
+            delta = top_line - prev_top
+            full_redraw = resized or abs(delta) >= h - 2
+            scroll_by = 0 if full_redraw else delta
+
+        # Give the whole screen back to the other views
+        stdscr.setscrreg(0, h - 1)
+
+    def _build_flat_view(self):
+        """Build the visible (module_index, indent_level, item) rows from scratch."""
+        flat_view = []
+        module_pos = []
+        modules = self.modules
+        subsection_lists = self._subsection_lists
+        is_expanded = self._is_expanded
+        append = flat_view.append
+        for i in range(len(modules)):
+            module_pos.append(len(flat_view))
+            append((i, 0, modules[i]))  # (index, indent_level, module)
+            if is_expanded[i]:
+                # Add a "fake" entry for each subsection
+                flat_view.extend([(i, 1, name) for name in subsection_lists[i]])
+
+        self._flat_view = flat_view
+        self._module_pos = module_pos
+
+    def _move_to(self, pos):
+        """Select the row at pos in the flat view."""
+        self.current_pos = pos
+        self._current_module_idx, self._current_indent, _ = self._flat_view[pos]
+
+    def _shift_module_rows(self, module_idx, count):
+        """Move the rows of every module after module_idx down by count."""
+        module_pos = self._module_pos
+        for j in range(module_idx + 1, len(module_pos)):
+            module_pos[j] += count
+
+    def _expand(self, module_idx):
+        """Expand a module by splicing its subsection rows in below its own row."""
+        if self._is_expanded[module_idx]:
+            return
+        self._is_expanded[module_idx] = True
+        rows = [(module_idx, 1, name) for name in self._subsection_lists[module_idx]]
+        pos = self._module_pos[module_idx] + 1
+        self._flat_view[pos:pos] = rows
+        self._shift_module_rows(module_idx, len(rows))
+
+    def _collapse(self, module_idx):
+        """Collapse a module by cutting its subsection rows out of the flat view."""
+        if not self._is_expanded[module_idx]:
+            return
+        self._is_expanded[module_idx] = False
+        count = len(self._subsection_lists[module_idx])
+        pos = self._module_pos[module_idx] + 1
+        del self._flat_view[pos:pos + count]
+        self._shift_module_rows(module_idx, -count)
 
     def toggle_current_item(self):
         """Toggle the currently selected item."""
-        # Create a list of visible items for the current view
-        visible_items = []
-        for i, module in enumerate(self.modules):
-            visible_items.append((i, 0, module))  # (index, indent_level, module)
-            if i in self.expanded_modules:
-                for subsection_name in module.subsections:
-                    visible_items.append((i, 1, subsection_name))
-
         # Get the current item
-        module_idx, indent_level, item = visible_items[self.current_pos]
+        module_idx, indent_level, item = self._flat_view[self.current_pos]
 
-        if isinstance(item, str):  # This is a subsection
+        if indent_level:  # This is a subsection
             # Toggle the subsection
             module = self.modules[module_idx]
             module.subsections[item] = not module.subsections[item]
@@ -759,154 +771,201 @@ class EnhancedTUI:
             # Toggle the module
             module = item
             module.enabled = not module.enabled
+            self._enabled_count += 1 if module.enabled else -1
             self.status_message = f"Module '{module.name}' " + \
                                   ("enabled" if module.enabled else "disabled")
 
     def toggle_expand_current_module(self):
         """Toggle the expansion state of the current module."""
-        # Create a list of visible items for the current view
-        visible_items = []
-        for i, module in enumerate(self.modules):
-            visible_items.append((i, 0, module))  # (index, indent_level, module)
-            if i in self.expanded_modules:
-                for subsection_name in module.subsections:
-                    visible_items.append((i, 1, subsection_name))
-
         # Get the current item
-        module_idx, indent_level, item = visible_items[self.current_pos]
+        module_idx, indent_level, item = self._flat_view[self.current_pos]
 
         if indent_level == 0:  # This is a module
             # Toggle expansion
-            if module_idx in self.expanded_modules:
-                self.expanded_modules.remove(module_idx)
+            if self._is_expanded[module_idx]:
+                self._collapse(module_idx)
                 self.status_message = f"Module '{self.modules[module_idx].name}' collapsed"
             else:
-                self.expanded_modules.add(module_idx)
+                self._expand(module_idx)
                 self.status_message = f"Module '{self.modules[module_idx].name}' expanded"
 
     def run(self):
         """Run the enhanced TUI."""
-        return curses.wrapper(self._run_ui)
+        try:
+            selected_modules = curses.wrapper(self._run_ui)
+        finally:
+            # Make sure the terminal is back in normal mode and nothing is left
+            # buffered before the diagnostics start writing to it
+            try:
+                if not curses.isendwin():
+                    curses.endwin()
+            except curses.error:
+                pass  # curses never started
+            sys.stdout.flush()
+            sys.stderr.flush()
+        if self._should_quit:
+            sys.exit(0)
+        return selected_modules
 
     def _run_ui(self, stdscr):
         """Internal method to run the UI with curses."""
         # Setup curses
         curses.curs_set(0)  # Hide cursor
         stdscr.timeout(-1)  # No timeout for getch
+        self._init_colors()
+        self._screen_size = stdscr.getmaxyx()
 
         # Run the menu loop
-        while not self.run_selected:
-            self.draw_main_menu(stdscr)
-            self.process_main_input(stdscr)
+        while not self.run_selected and not self._should_quit:
+            if self._dirty:
+                self.draw_main_menu(stdscr)
+                curses.doupdate()
+                self._dirty = False
+
+            # Block until a key arrives: nothing on the menu changes without input,
+            # so there is no frame timer to poll and no redraw to queue. Then handle
+            # keys already queued (up to a frame's worth) before drawing again
+            key = stdscr.getch()
+            handled = 0
+            while key != -1 and not self.run_selected and not self._should_quit:
+                self._dispatch(stdscr, key)
+                handled += 1
+                if handled >= _MAX_KEYS_PER_FRAME:
+                    break
+                stdscr.nodelay(True)
+                key = stdscr.getch()
+            stdscr.nodelay(False)
+
+        # Return the modules selected when r was pressed
+        return self._selected_cache
+
+    def _dispatch(self, stdscr, key):
+        """Apply one main-menu key press."""
+        if 0x41 <= key <= 0x5A:
+            key |= 0x20  # Fold ASCII upper case letters to lower case
+        if self._confirm_state == "quit":
+            if self._on_confirm_quit(stdscr, key):
+                self._dirty = True
+            return
+
+        handler = self._key_handlers.get(key)
+        # Unbound keys and handlers that changed nothing skip the redraw
+        if handler is not None and handler(stdscr):
+            self._dirty = True
+
+    # Main-menu key handlers; each returns True when the menu needs redrawing
+
+    def _on_quit(self, stdscr):
+        """Ask for confirmation; the next key press answers it."""
+        self._confirm_state = "quit"
+        return True
+
+    def _on_confirm_quit(self, stdscr, key):
+        """Answer the quit prompt: y quits, any other key dismisses it."""
+        if key == curses.KEY_RESIZE:
+            # Not an answer; keep the prompt up at the new size
+            return self._on_resize(stdscr)
+        self._confirm_state = None
+        if key == ord('y'):
+            # Leave the loop; run() exits once curses has restored the terminal
+            self._should_quit = True
+        return True
+
+    def _on_run(self, stdscr):
+        """Run diagnostics."""
+        if self._enabled_count == 0:
+            self.status_message = "Error: No modules selected. Please select at least one module."
+        else:
+            self._selected_cache = [module for module in self.modules if module.enabled]
+            self.run_selected = True
+        return True
+
+    def _on_export(self, stdscr):
+        """Show export options."""
+        # This is just a placeholder - actual export happens after running diagnostics
+        message = "Note: Export options available after running diagnostics"
+        if self.status_message == message:
+            return False
+        self.status_message = message
+        return True
 
-        # Return the selected modules
-        return [module for module in self.modules if module.enabled]
+    def _on_up(self, stdscr):
+        """Move selection up; nothing to redraw at the top."""
+        if self.current_pos == 0:
+            return False
+        self._move_to(self.current_pos - 1)
+        return True
 
-    def process_main_input(self, stdscr):
-        """Process input in the main menu."""
-        key = stdscr.getch()
+    def _on_down(self, stdscr):
+        """Move selection down; nothing to redraw at the bottom."""
+        if self.current_pos >= len(self._flat_view) - 1:
+            return False
+        self._move_to(self.current_pos + 1)
+        return True
 
-        if key == ord('q') or key == ord('Q'):
-            # Confirm quit
-            h, w = stdscr.getmaxyx()
-            confirm_msg = "Are you sure you want to quit? (y/n)"
-            stdscr.attron(curses.A_BOLD)
-            stdscr.addstr(h - 4, (w - len(confirm_msg)) // 2, confirm_msg)
-            stdscr.attroff(curses.A_BOLD)
-            stdscr.refresh()
-
-            confirm = stdscr.getch()
-            if confirm == ord('y') or confirm == ord('Y'):
-                sys.exit(0)
-
-        elif key == ord('r') or key == ord('R'):
-            # Run diagnostics
-            selected_modules = [module for module in self.modules if module.enabled]
-            if not selected_modules:
-                self.status_message = "Error: No modules selected. Please select at least one module."
-            else:
-                self.run_selected = True
-
-        elif key == ord('e') or key == ord('E'):
-            # Show export options
-            # This is just a placeholder - actual export happens after running diagnostics
-            self.status_message = "Note: Export options available after running diagnostics"
-
-        elif key == curses.KEY_UP or key == ord('k') or key == ord('K'):
-            # Move selection up
-            self.current_pos = max(0, self.current_pos - 1)
-
-        elif key == curses.KEY_DOWN or key == ord('j') or key == ord('J'):
-            # Create a list of visible items for the current view
-            visible_items = []
-            for i, module in enumerate(self.modules):
-                visible_items.append((i, 0, module))
-                if i in self.expanded_modules:
-                    for subsection_name in module.subsections:
-                        visible_items.append((i, 1, subsection_name))
-
-            # Move selection down
-            self.current_pos = min(len(visible_items) - 1, self.current_pos + 1)
-
-        elif key == ord(' '):
-            # Toggle module or subsection (check/uncheck)
-            self.toggle_current_item()
-
-        elif key == 10 or key == 13:  # Enter key
-            # Toggle expand/collapse for the current module
-            self.toggle_expand_current_module()
-
-        elif key == curses.KEY_RIGHT:
-            # Expand the current module if it's not already expanded
-            visible_items = []
-            for i, module in enumerate(self.modules):
-                visible_items.append((i, 0, module))
-                if i in self.expanded_modules:
-                    for subsection_name in module.subsections:
-                        visible_items.append((i, 1, subsection_name))
-
-            module_idx, indent_level, item = visible_items[self.current_pos]
-            if indent_level == 0 and module_idx not in self.expanded_modules:
-                self.expanded_modules.add(module_idx)
-                self.status_message = f"Module '{self.modules[module_idx].name}' expanded"
+    def _on_toggle(self, stdscr):
+        """Toggle module or subsection (check/uncheck)."""
+        self.toggle_current_item()
+        return True
 
-        elif key == curses.KEY_LEFT:
-            # Collapse the current module if it's expanded
-            visible_items = []
-            for i, module in enumerate(self.modules):
-                visible_items.append((i, 0, module))
-                if i in self.expanded_modules:
-                    for subsection_name in module.subsections:
-                        visible_items.append((i, 1, subsection_name))
-
-            module_idx, indent_level, item = visible_items[self.current_pos]
-            if indent_level == 0 and module_idx in self.expanded_modules:
-                self.expanded_modules.remove(module_idx)
-                self.status_message = f"Module '{self.modules[module_idx].name}' collapsed"
+    def _on_toggle_expand(self, stdscr):
+        """Toggle expand/collapse for the current module; subsection rows have nothing to toggle."""
+        if self._current_indent:
+            return False
+        self.toggle_expand_current_module()
+        return True
 
-        elif key == ord('a') or key == ord('A'):
-            # Enable all modules
-            for module in self.modules:
-                module.enabled = True
-                module.set_all_subsections(True)
-            self.status_message = "All modules and subsections enabled"
-
-        elif key == ord('n') or key == ord('N'):
-            # Disable all modules
-            for module in self.modules:
-                module.enabled = False
-                module.set_all_subsections(False)
-            self.status_message = "All modules and subsections disabled"
-
-    def show_export_options(self, stdscr, report):
-        """Show and process export options."""
+    def _on_expand(self, stdscr):
+        """Expand the current module if it's not already expanded."""
+        module_idx = self._current_module_idx
+        if self._current_indent or self._is_expanded[module_idx]:
+            return False
+        self._expand(module_idx)
+        self.status_message = f"Module '{self.modules[module_idx].name}' expanded"
+        return True
+
+    def _on_collapse(self, stdscr):
+        """Collapse the current module if it's expanded."""
+        module_idx = self._current_module_idx
+        if self._current_indent or not self._is_expanded[module_idx]:
+            return False
+        self._collapse(module_idx)
+        self.status_message = f"Module '{self.modules[module_idx].name}' collapsed"
+        return True
+
+    def _on_resize(self, stdscr):
+        """Redraw the whole screen at the new size."""
+        self._screen_size = stdscr.getmaxyx()
+        self._prev_frame = None
+        return True
+
+    def _on_enable_all(self, stdscr):
+        """Enable all modules."""
+        for module in self.modules:
+            module.set_bulk(True)
+        self._enabled_count = len(self.modules)
+        self.status_message = "All modules and subsections enabled"
+        return True
+
+    def _on_disable_all(self, stdscr):
+        """Disable all modules."""
+        for module in self.modules:
+            module.set_bulk(False)
+        self._enabled_count = 0
+        self.status_message = "All modules and subsections disabled"
+        return True
+
+    def show_export_options(self, stdscr, report, report_gen):
+        """Show and process export options for report, the text rendering of report_gen."""
+        self._init_colors()
         self.draw_export_menu(stdscr)
+        curses.doupdate()
 
         # Get user choice
         choice = stdscr.getkey()
 
         if choice in ['1', '2', '3', '4', '5', '6']:
-            result = self.handle_export_choice(choice, report, stdscr)
+            result = self.handle_export_choice(choice, report, report_gen, stdscr)
 
             if result == "__DISPLAY_ONLY__":
                 # Display the report